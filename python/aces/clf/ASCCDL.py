@@ -55,7 +55,7 @@ WHETHER DISCLOSED OR UNDISCLOSED.
 import xml.etree.ElementTree as etree
 
 from ProcessNode import *
-from Common import getFeatureCompatibility, featureSets
+from Common import getFeatureCompatibility, featureSets, clampArray
 import Errors
 
 class ASCCDL(ProcessNode):
@@ -78,6 +78,26 @@ class ASCCDL(ProcessNode):
     def setSaturation(self, s):
         self._values['saturation'] = s
 
+    # The slope, offset and power for each channel and the saturation, 
+    # using the default values for those that aren't set
+    def getParameters(self):
+        slope = [1.0, 1.0, 1.0]
+        offset = [0.0, 0.0, 0.0]
+        power = [1.0, 1.0, 1.0]
+        saturation = 1.0
+
+        if 'slope' in self._values: 
+            slope = self._values['slope']
+        if 'offset' in self._values: 
+            offset = self._values['offset']
+        if 'power' in self._values: 
+            power = self._values['power']
+        if 'saturation' in self._values: 
+            saturation = self._values['saturation']
+
+        return (slope, offset, power, saturation)
+    # getParameters
+
     # Read / Write
     def write(self, tree):
         node = ProcessNode.write(self, tree)
@@ -143,19 +163,7 @@ class ASCCDL(ProcessNode):
                 raise Errors.UnsupportedExtensionError(msg)
 
         # Node parameters
-        slope = [1.0, 1.0, 1.0]
-        offset = [0.0, 0.0, 0.0]
-        power = [1.0, 1.0, 1.0]
-        saturation = 1.0
-
-        if 'slope' in self._values: 
-            slope = self._values['slope']
-        if 'offset' in self._values: 
-            offset = self._values['offset']
-        if 'power' in self._values: 
-            power = self._values['power']
-        if 'saturation' in self._values: 
-            saturation = self._values['saturation']
+        (slope, offset, power, saturation) = self.getParameters()
 
         '''
         print( "slope      : %s" % slope )
@@ -233,6 +241,72 @@ class ASCCDL(ProcessNode):
         return outValues
     # process
 
+    def prepare(self, precision=precisions["FLOAT32"]):
+        # Base attributes. ColorCorrection nodes don't have bit depths
+        inBitDepth = self.getAttribute('inBitDepth')
+        outBitDepth = self.getAttribute('outBitDepth')
+
+        # Node attributes
+        style = ''
+        if 'style' in self._attributes: style = self._attributes['style']
+
+        if (not(getFeatureCompatibility() & featureSets["Autodesk"]) and
+            style in ['v1.2_Fwd', 'noClampFwd', 'v1.2_Rev', 'noClampRev']):
+                msg = "Unsupported feature : Autodesk CDL style keyword %s" % style
+                raise Errors.UnsupportedExtensionError(msg)
+
+        # Node parameters, as per-channel vectors
+        computeType = precisionComputeType(precision)
+        parameters = [np.array(parameter, dtype=computeType) for parameter in self.getParameters()]
+        inSize = bitDepthSize(inBitDepth)
+        outSize = bitDepthSize(outBitDepth)
+
+        def kernel(values, out):
+            # Pass through if there aren't at least three channels
+            if values.shape[1] < 3:
+                out[...] = values
+            else:
+                normalized = np.asarray(values, computeType)/inSize
+                out[...] = applyCDL(normalized, style, *parameters)*outSize
+            return out
+
+        return kernel
+    # prepare
+
+    # Forward styles without clamping are affine when the power is 1
+    def getAffine(self):
+        # Base attributes
+        inBitDepth = self.getAttribute('inBitDepth')
+        outBitDepth = self.getAttribute('outBitDepth')
+
+        # Node attributes
+        style = ''
+        if 'style' in self._attributes: style = self._attributes['style']
+
+        if not style in ['FwdNoClamp', 'noClampFwd']:
+            return None
+        if (not(getFeatureCompatibility() & featureSets["Autodesk"]) and
+            style == 'noClampFwd'):
+            return None
+
+        # Node parameters
+        (slope, offset, power, saturation) = self.getParameters()
+
+        if list(power) != [1.0, 1.0, 1.0]:
+            return None
+
+        # Saturation mixes each channel with luma
+        luma = np.array([0.2126, 0.7152, 0.0722])
+        saturationMatrix = saturation*np.identity(3) + (1.0 - saturation)*np.outer(np.ones(3), luma)
+
+        scale = bitDepthSize(outBitDepth) / bitDepthSize(inBitDepth)
+
+        affine = np.zeros((3, 4), dtype=np.float64)
+        affine[:, :3] = scale*np.dot(saturationMatrix, np.diag(slope))
+        affine[:, 3] = bitDepthSize(outBitDepth)*np.dot(saturationMatrix, offset)
+        return affine
+    # getAffine
+
     def printInfoChild(self):
         #print( "ASC_CDL" )
         for key, value in self._values.iteritems():
@@ -250,6 +324,43 @@ class ASCCDL(ProcessNode):
     # printInfoChild
 # ASCCDL
 
+#
+# Applies an ASC CDL to an (N, 3) array of normalized values, using the same
+# steps as ASCCDL.process for each style
+#
+def applyCDL(values, style, slope, offset, power, saturation):
+    def luma(rgb):
+        return (0.2126 * rgb[:, 0:1] + 0.7152 * rgb[:, 1:2] + 0.0722 * rgb[:, 2:3])
+
+    # Negative values and NaNs are raised to powers in the noClamp styles
+    with np.errstate(invalid='ignore'):
+        if style == 'Fwd' or style == 'v1.2_Fwd':
+            result = np.power( clampArray( values * slope + offset ), power )
+            result = clampArray( luma(result) + saturation * (result - luma(result)) )
+
+        elif style == 'FwdNoClamp' or style == 'noClampFwd':
+            tmp = values * slope + offset
+            result = np.where(tmp < 0, tmp, np.power(tmp, power))
+            result = luma(result) + saturation * (result - luma(result))
+
+        elif style == 'Rev' or style == 'v1.2_Rev':
+            result = clampArray( values )
+            outSat = luma(result) + (1.0/saturation) * (result - luma(result))
+            result = clampArray( ( np.power( clampArray(outSat), 1.0/power ) - offset ) / slope )
+
+        elif style == 'RevNoClamp' or style == 'noClampRev':
+            outSat = luma(values) + (1.0/saturation) * (values - luma(values))
+            result = np.where(outSat < 0, 
+                ( clampArray(outSat) - offset ) / slope,
+                ( np.power( clampArray(outSat), 1.0/power ) - offset ) / slope )
+
+        # Unknown styles leave values unchanged
+        else:
+            result = np.array(values)
+
+    return result
+# applyCDL
+
 class ColorCorrection(ASCCDL):
     "A Common LUT Format ColorCorrection ProcessNode element"
 
@@ -54,19 +54,35 @@ WHETHER DISCLOSED OR UNDISCLOSED.
 
 import math
 import numpy as np
-try:
-    from scipy.interpolate import interp1d, LinearNDInterpolator
-    sciPyEnabled = True
-    raise ImportError('A very specific bad thing happened')
-except ImportError, e:
-    #print( "Scipy import failed" )
-    sciPyEnabled = False
 
 import xml.etree.ElementTree as etree
 
 from Common import *
 import Errors
 
+#
+# An Array's XML element. The text is formatted from the Array's values when
+# it's read, so writing a ProcessList doesn't keep the text of every Array in
+# memory. Setting the text replaces the formatted values.
+#
+class ArrayElement(etree.Element):
+    def __init__(self, tag, array):
+        etree.Element.__init__(self, tag)
+        self._array = array
+        self._text = None
+
+    def iterTextChunks(self):
+        if self._text != None:
+            return iter([self._text])
+        return self._array.iterTextChunks()
+
+    def _getText(self):
+        return "".join(self.iterTextChunks())
+    def _setText(self, text):
+        self._text = text
+    text = property(_getText, _setText)
+# ArrayElement
+
 class Array:
     "A Common LUT Format Array element"
 
@@ -85,7 +101,7 @@ class Array:
         self._floatEncoding = floatEncoding
         self._elementType = elementType
 
-        self._interp1ds = None
+        self._cubicCoefficients = None
 
         # Create the interpolators that we'll use later
         if self._values != [] and self._dimensions != []:
@@ -98,6 +114,13 @@ class Array:
     def getDimensions(self):
         return self._dimensions
 
+    # The number of values described by the dimensions. Matrix dimensions 
+    # list the rows, the columns and the number of color components.
+    def getValueCount(self):
+        if len(self._dimensions) == 3:
+            return self._dimensions[0]*self._dimensions[1]
+        return int(np.prod(self._dimensions))
+
     def setValues(self, values):
         self._values = values
 
@@ -131,12 +154,29 @@ class Array:
 
     # Read / Write
     def write(self, tree):
-        element = etree.SubElement(tree, self._elementType)
+        # The element's text is formatted from the values when it's used. 
+        # ProcessList.writeFile streams it to disk in chunks.
+        element = ArrayElement(self._elementType, self)
+        tree.append(element)
         element.set('dim', " ".join(map(str, self._dimensions)))
-        
-        # Slightly prettier printing
-        element.text = "\n"
 
+        # Floats encoded using bitwise equivalent hex or integer values
+        # Encoding options: 
+        # integer16bit, integer32bit, integer64bit, hex16bit, hex32bit, hex64bit
+        if self._floatEncoding != 'string':
+            if getFeatureCompatibility() & featureSets["Duiker Research"]:
+                if self._floatEncoding in floatEncodingTypes:
+                    element.set('floatEncoding', self._floatEncoding)
+            else:
+                msg = "Unsupported feature : Array floatEncoding"
+                raise Errors.UnsupportedExtensionError(msg)
+
+        return element
+    # write
+
+    # The text of the Array element, one row of values per line, generated 
+    # in chunks of rows. Each chunk is formatted with a single operation.
+    def iterTextChunks(self, rowsPerChunk=4096):
         # Use the last value for 1D or 3D LUTs
         if len(self._dimensions) in [2, 4]:
             columns = self._dimensions[-1]
@@ -145,68 +185,45 @@ class Array:
         else:
             columns = self._dimensions[1]
 
-        integers = self._valuesAreIntegers
-
-        for n in range(len(self._values)/columns):
-            sample = self._values[n*columns:(n+1)*columns]
-
-            # Integer values
-            if integers:
-                sampleText = " ".join(map(lambda x: "%15s" % str(int(x)), sample))
-
-            # Float Values
-            # Floats encoded using bitwise equivalent hex or integer values
-            if self._floatEncoding != 'string':
-                # Encoding options: 
-                # integer16bit, integer32bit, integer64bit, hex16bit, hex32bit, hex64bit
-                if getFeatureCompatibility() & featureSets["Duiker Research"]:
-                    if self._floatEncoding in ['integer16bit', 'integer32bit', 'integer64bit', 
-                        'hex16bit', 'hex32bit', 'hex64bit']:
-                        element.set('floatEncoding', self._floatEncoding)
-
-                    if self._rawHalfs or self._floatEncoding == 'integer16bit':
-                        sample = map(halfToUInt16, sample)
-                        sampleText = " ".join(map(lambda x: "%15s" % str(int(x)), sample))
-                    elif self._floatEncoding == 'integer32bit':
-                        sample = map(float32ToUInt32, sample)
-                        sampleText = " ".join(map(lambda x: "%15s" % str(int(x)), sample))
-                    elif self._floatEncoding == 'integer64bit':
-                        sample = map(doubleToUInt64, sample)
-                        sampleText = " ".join(map(lambda x: "%15s" % str(int(x)), sample))
-
-                    elif self._floatEncoding == 'hex16bit':
-                        sample = map(halfToHex, sample)
-                        sampleText = " ".join(map(lambda x: "%15s" % str(x), sample))
-                    elif self._floatEncoding == 'hex32bit':
-                        sample = map(float32ToHex, sample)
-                        sampleText = " ".join(map(lambda x: "%15s" % str(x), sample))
-                    elif self._floatEncoding == 'hex64bit':
-                        sample = map(doubleToHex, sample)
-                        sampleText = " ".join(map(lambda x: "%16s" % str(x), sample))
-
-                    # An unknown encoding. Will be ignored.
-                    else:
-                        sampleText = " ".join(map(lambda x: "%15s" % ("%6.9f" % float(x)), sample))
-                else:
-                    msg = "Unsupported feature : Array floatEncoding"
-                    raise Errors.UnsupportedExtensionError(msg)
+        # 'rawHalfs' functionality. equivalent to 'floatEncoding' = 'integer16bit'
+        if self._rawHalfs:
+            encoding = 'integer16bit'
+        else:
+            encoding = self._floatEncoding
+
+        # Values are encoded a chunk at a time
+        if encoding in ['integer16bit', 'integer32bit', 'integer64bit']:
+            (floatType, uintType) = floatEncodingTypes[encoding]
+            encode = lambda chunk: floatsToUInts(chunk, floatType, uintType).tolist()
+            valueFormat = "%15d"
+        elif encoding in ['hex16bit', 'hex32bit', 'hex64bit']:
+            floatType = floatEncodingTypes[encoding][0]
+            encode = lambda chunk: floatsToHex(chunk, floatType)
+            if encoding == 'hex64bit':
+                valueFormat = "%16s"
+            else:
+                valueFormat = "%15s"
 
-            # 'rawHalfs' functionality. equivalent to 'floatEncoding' = 'integer16bit'
-            elif self._rawHalfs:
-                sample = map(halfToUInt16, sample)
-                sampleText = " ".join(map(lambda x: "%15s" % str(int(x)), sample))
+        # Floats printed as strings. Unknown encodings are ignored.
+        else:
+            encode = lambda chunk: np.asarray(chunk, dtype=np.float64).tolist()
+            valueFormat = "%15.9f"
 
-            # Floats printed as strings
-            else:
-                sampleText = " ".join(map(lambda x: "%15s" % ("%6.9f" % float(x)), sample))
-            element.text += sampleText + "\n"
+        rowFormat = " ".join([valueFormat]*columns) + "\n"
+        rows = len(self._values)/columns
+
+        # Slightly prettier printing
+        yield "\n"
+
+        for row in range(0, rows, rowsPerChunk):
+            chunkRows = min(rowsPerChunk, rows - row)
+            chunk = encode(self._values[row*columns:(row + chunkRows)*columns])
+            yield (rowFormat*chunkRows) % tuple(chunk)
 
         # Hack
         # Will correct formatting for CLFs. Not Clip though...
-        element.text += "\t\t"
-
-        return element
-    # write
+        yield "\t\t"
+    # iterTextChunks
 
     def read(self, element):
         # Store attributes
@@ -216,33 +233,43 @@ class Array:
             elif key == 'floatEncoding':
                 self._floatEncoding = value
 
-        dtype = np.float32
-        if self._rawHalfs or self._floatEncoding == 'integer16bit':
-            cast = lambda x: float(uint16ToHalf(x))
-            dtype = np.float16
-        elif self._floatEncoding == 'integer32bit':
-            cast = uint32ToFloat32
-            dtype = np.float32
-        elif self._floatEncoding == 'integer64bit':
-            cast = uint64ToDouble
-            dtype = np.float64
-        elif self._floatEncoding == 'hex16bit':
-            cast = hexToHalf
-            dtype = np.float16
-        elif self._floatEncoding == 'hex32bit':
-            cast = hexToFloat32
-            dtype = np.float32
-        elif self._floatEncoding == 'hex64bit':
-            cast = hexToDouble
-            dtype = np.float64
+        # 'rawHalfs' functionality. equivalent to 'floatEncoding' = 'integer16bit'
+        if self._rawHalfs:
+            encoding = 'integer16bit'
+        else:
+            encoding = self._floatEncoding
+
+        # Floats encoded as integers are parsed as unsigned integers of the 
+        # same size and reinterpreted as floats
+        if encoding in ['integer16bit', 'integer32bit', 'integer64bit']:
+            (floatType, uintType) = floatEncodingTypes[encoding]
+            numValues = uintsToFloats(np.fromstring(element.text, dtype=uintType, sep=' '), 
+                floatType, uintType)
+
+        # Floats encoded as hex digits are decoded together. Every value 
+        # needs all of its digits.
+        elif encoding in ['hex16bit', 'hex32bit', 'hex64bit']:
+            floatType = floatEncodingTypes[encoding][0]
+            digits = 2*np.dtype(floatType).itemsize
+            textValues = element.text.split()
+            if set(map(len, textValues)) - set([digits]):
+                msg = "Array values encoded as %s should have %d hex digits" % (encoding, digits)
+                raise Errors.InvalidArrayError(msg)
+            try:
+                numValues = hexToFloats(textValues, floatType)
+            except TypeError:
+                msg = "Array values encoded as %s should only use hex digits" % encoding
+                raise Errors.InvalidArrayError(msg)
+
+        # Decimal floats and integers are parsed in a single call
         else:
-            cast = float
-            dtype = np.float32
+            numValues = np.fromstring(element.text, dtype=np.float64, sep=' ').astype(np.float32)
 
-        textValues = element.text.split()
-        numValues = np.zeros(len(textValues), dtype=dtype)
-        for i in range(len(textValues)):
-            numValues[i] = cast(textValues[i])
+        # Parsing stops at the first value that isn't a number
+        if self._dimensions != [] and len(numValues) != self.getValueCount():
+            msg = "Array with dimensions %s has %d values. Expected %d values" % (
+                " ".join(map(str, self._dimensions)), len(numValues), self.getValueCount())
+            raise Errors.InvalidArrayError(msg)
 
         self.setValues(numValues)
     # read
@@ -293,29 +320,46 @@ class Array:
     #
     # Interpolators
     #
+
+    # Cubic interpolation uses Catmull-Rom splines through the LUT entries.
+    # The polynomial coefficients for each segment between two entries are
+    # stored as an (entries-1, 4, 3) array, in increasing powers, with one
+    # column per channel. LUTs with fewer than 4 entries and half-domain LUTs
+    # don't use cubic interpolation.
     def create1dInterpolators(self):
         dimensions = self._dimensions
 
         #print( "Creating 1D interpolator" )
 
-        self._interp1ds = []
+        self._cubicCoefficients = None
+
+        if dimensions[0] >= 4 and dimensions[0] < 65536:
+            values = self.get1DTable(np.float64)
+
+            # Infinite LUT values give NaN coefficients for their segments
+            with np.errstate(invalid='ignore'):
+                # Tangents use the neighbouring entries. At the ends of the 
+                # LUT, they use the quadratic through the last three entries
+                tangents = np.empty(values.shape)
+                tangents[1:-1] = (values[2:] - values[:-2])/2.0
+                tangents[0] = (-3.0*values[0] + 4.0*values[1] - values[2])/2.0
+                tangents[-1] = (3.0*values[-1] - 4.0*values[-2] + values[-3])/2.0
 
-        if sciPyEnabled:
-            if dimensions[0] >= 4 and dimensions[0] < 65536:
-                for channel in range(dimensions[1]):
-                    indices = np.arange(0, dimensions[0])
-                    output = np.zeros(dimensions[0], dtype=np.float32)
-                    for i in range(len(output)):
-                        output[i] = self.lookup1D(i, channel)
+                # Cubic Hermite polynomial for each segment
+                (value1, value2) = (values[:-1], values[1:])
+                (tangent1, tangent2) = (tangents[:-1], tangents[1:])
 
-                    #print( indices )
-                    #print( output )
+                coefficients = np.empty((dimensions[0]-1, 4, 3))
+                coefficients[:, 0] = value1
+                coefficients[:, 1] = tangent1
+                coefficients[:, 2] = 3.0*(value2 - value1) - 2.0*tangent1 - tangent2
+                coefficients[:, 3] = 2.0*(value1 - value2) + tangent1 + tangent2
 
-                    # Create a cubic interpolator using the indices and array values
-                    cubicInterpolator = interp1d(indices, output, 
-                        kind='cubic', bounds_error=False, fill_value=0.0)
+            self._cubicCoefficients = coefficients
+    # create1dInterpolators
 
-                    self._interp1ds.append(cubicInterpolator)
+    def getCubicCoefficients(self):
+        return self._cubicCoefficients
 
     #
     # Lookup values
@@ -506,30 +550,161 @@ class Array:
         return result
     # lookup1DLinear
 
+    #
+    # Whole-buffer lookups
+    #
+
+    # The 1D LUT values as an (entries, 3) array with one column per channel.
+    # Follows the channel rules of lookup1D.
+    def get1DTable(self, dtype=np.float32):
+        dimensions = self._dimensions
+        values = np.asarray(self._values, dtype=dtype)
+
+        if dimensions[1] == 3:
+            table = values.reshape(dimensions[0], 3)
+        else:
+            table = np.repeat(values[:dimensions[0]].reshape(dimensions[0], 1), 3, axis=1)
+
+        return np.ascontiguousarray(table)
+    # get1DTable
+
+    # 1D linear interpolation lookup for an (N, C) array of positions, with C
+    # of 3 or less. 'table' is the result of get1DTable. Handles positions 
+    # outside of the LUT, NaNs and Infs in the same way as lookup1DLinear.
+    def lookup1DLinearArray(self, positions, table=None):
+        if table is None:
+            table = self.get1DTable(positions.dtype)
+        (entries, channels) = (table.shape[0], positions.shape[1])
+
+        index = positions*(entries-1)
+        finite = np.isfinite(index)
+
+        # Positions outside of the LUT use the first or last entry
+        clampedIndex = np.clip(np.where(finite, index, 0), 0, entries-1)
+        indexLow = np.minimum(clampedIndex.astype(np.intp), max(0, entries-2))
+        indexHigh = np.minimum(indexLow + 1, entries-1)
+        interp = clampedIndex - indexLow
+
+        flatTable = table.ravel()
+        channelOffsets = np.arange(channels)
+        value1 = flatTable[indexLow*3 + channelOffsets]
+        value2 = flatTable[indexHigh*3 + channelOffsets]
+
+        result = (1-interp)*value1 + interp*value2
+
+        # NaNs and Infs are passed through
+        return np.where(finite, result, index)
+    # lookup1DLinearArray
+
+    # 1D Half-Domain interpolated lookup for an (N, C) array of positions, 
+    # with C of 3 or less. 'table' is the result of get1DTable. Uses the same
+    # half-float codes, NaN and Inf indices and arithmetic as 
+    # lookup1DHalfDomainInterpolated, so float32 positions give the same 
+    # results. The interpolation uses the type of 'table'.
+    def lookup1DHalfDomainArray(self, positions, table=None):
+        if table is None:
+            table = self.get1DTable(positions.dtype)
+        (entries, channels) = (table.shape[0], positions.shape[1])
+
+        # NaNs and Infs are compared and subtracted before being handled below
+        with np.errstate(invalid='ignore'):
+            # The nearest half-float values and their 16 bit integer codes
+            halfValue1 = positions.astype(np.float16)
+            index1 = halfValue1.view(np.uint16).astype(np.int32)
+            floatDifference = positions - halfValue1
+
+            # The neighbouring half-float value on the other side of the position
+            # See lookup1DHalfDomainInterpolated for the layout of the codes
+            negative = positions < 0.0
+            offset = np.where(negative, -1, 1)
+            offset = np.where(floatDifference >= 0.0, offset, -offset)
+            indexMin = np.where(negative, 32768, 0)
+            indexMax = np.where(negative, 64511, 31743)
+            index2 = np.minimum(np.maximum(index1 + offset, indexMin), indexMax)
+            halfValue2 = index2.astype(np.uint16).view(np.float16)
+
+            halfRange = halfValue2 - halfValue1
+            nonZeroRange = halfRange != 0.0
+            ratio = np.where(nonZeroRange, 
+                floatDifference/np.where(nonZeroRange, halfRange, np.float16(1.0)), 0.0)
+            ratio = ratio.astype(floatDifference.dtype)
+
+            # NaNs and Infs use fixed entries
+            isNaN = np.isnan(halfValue1)
+            isInf = np.isinf(halfValue1)
+            special = isNaN | isInf
+            specialIndex = np.where(isNaN, 31745, np.where(negative, 64512, 31744))
+            index1 = np.where(special, specialIndex, index1)
+            index2 = np.where(special, specialIndex, index2)
+
+            # Lookup values in LUT using integer indices
+            flatTable = table.ravel()
+            channelOffsets = np.arange(channels)
+            value1 = flatTable[np.minimum(index1, entries-1)*3 + channelOffsets]
+            value2 = flatTable[np.minimum(index2, entries-1)*3 + channelOffsets]
+
+            # Interpolate
+            result = (1-ratio)*value1 + ratio*value2
+
+        return np.where(special, value1, result)
+    # lookup1DHalfDomainArray
+
+    # 1D cubic interpolation lookup for an (N, C) array of positions, with C
+    # of 3 or less. Handles positions outside of the LUT and NaNs in the same
+    # way as lookup1DCubic.
+    def lookup1DCubicArray(self, positions, coefficients=None):
+        if coefficients is None:
+            coefficients = self._cubicCoefficients
+        if coefficients is None:
+            return self.lookup1DLinearArray(positions)
+        (segments, channels) = (coefficients.shape[0], positions.shape[1])
+
+        index = positions*segments
+        isNaN = np.isnan(index)
+
+        clampedIndex = np.clip(np.where(isNaN, 0, index), 0, segments)
+        segment = np.minimum(clampedIndex.astype(np.intp), segments-1)
+        t = clampedIndex - segment
+
+        flatCoefficients = coefficients.reshape(segments, 12).ravel()
+        offsets = segment*12 + np.arange(channels)
+        (a, b, c, d) = [flatCoefficients[offsets + power*3] for power in range(4)]
+
+        result = ((d*t + c)*t + b)*t + a
+
+        # NaNs are passed through
+        return np.where(isNaN, index, result)
+    # lookup1DCubicArray
+
     # 1D cubic interpolation lookup
-    def lookup1DCubic(self, position, channel, useSciPy=False):
+    def lookup1DCubic(self, position, channel):
         dimensions = self._dimensions
+        coefficients = self._cubicCoefficients
 
-        if dimensions[0] < 4 or not useSciPy or not sciPyEnabled:
-            return lookup1DLinear(position, channel)
+        if coefficients is None:
+            return self.lookup1DLinear(position, channel)
 
         index = position*(dimensions[0]-1)
 
+        # NaNs
+        if np.isnan(index):
+            result = index
+
         # Handle out of bounds positions
-        if index < 0:
+        elif index <= 0:
             result = self.lookup1D(0, channel)
-        elif index >= dimensions[0]:
+        elif index >= dimensions[0]-1:
             result = self.lookup1D(dimensions[0]-1, channel)
 
         # Use cubic interpolation
         else:
-            if not self._interp1ds:
-                self.create1dInterpolators()
-
-            lutChannel = min(dimensions[1], channel)
-            result = self._interp1ds[lutChannel](index)
+            segment = int(math.floor(index))
+            t = index - segment
+            (a, b, c, d) = coefficients[segment, :, max(0, min(2, channel))]
+            result = ((d*t + c)*t + b)*t + a
 
         return result
+    # lookup1DCubic
 
     def lookup3D(self, index3):
         values = self._values
@@ -600,6 +775,62 @@ class Array:
         return enclosingCubeColors[0];
     # lookup3DTrilinear
 
+    # The 3D LUT values as an (R, G, B, 3) array
+    def get3DTable(self, dtype=np.float32):
+        dimensions = self._dimensions
+        values = np.asarray(self._values, dtype=dtype)
+        return values.reshape(dimensions[0], dimensions[1], dimensions[2], 3)
+    # get3DTable
+
+    # The LUT indices below and above each position in an (N, 3) array, and
+    # the interpolation factors between them. Positions are clamped to the
+    # LUT and NaNs use the first entry, as in lookup3DTrilinear.
+    def get3DIndicesArray(self, positions):
+        dimensions = np.array(self._dimensions[:3])
+
+        position = np.clip(np.where(np.isnan(positions), 0.0, positions), 0.0, 1.0)
+        index = position*(dimensions-1).astype(positions.dtype)
+
+        indexLow = np.floor(index)
+        interp = index - indexLow
+        indexLow = indexLow.astype(np.intp)
+        indexHigh = np.minimum(indexLow + 1, dimensions-1)
+
+        return (indexLow, indexHigh, interp)
+    # get3DIndicesArray
+
+    # Trilinear interpolation for an (N, 3) array of positions. 'table' is 
+    # the result of get3DTable.
+    def lookup3DTrilinearArray(self, positions, table=None):
+        if table is None:
+            table = self.get3DTable(positions.dtype)
+        (indexLow, indexHigh, interp) = self.get3DIndicesArray(positions)
+        (dimensionR, dimensionG, dimensionB) = table.shape[:3]
+        flatTable = table.reshape(-1, 3)
+
+        # Offsets into the flattened table for the lower and upper indices
+        offsetsR = (indexLow[:, 0]*dimensionG*dimensionB, indexHigh[:, 0]*dimensionG*dimensionB)
+        offsetsG = (indexLow[:, 1]*dimensionB, indexHigh[:, 1]*dimensionB)
+        offsetsB = (indexLow[:, 2], indexHigh[:, 2])
+        (interpR, interpG, interpB) = (interp[:, 0:1], interp[:, 1:2], interp[:, 2:3])
+
+        def mixArray(value1, value2, mixAmount):
+            return (1 - mixAmount)*value1 + mixAmount*value2
+
+        # Interpolate along the lines in B, then G, then R, sampling the
+        # corners of the enclosing cube as they're needed
+        result = []
+        for offsetR in offsetsR:
+            lines = []
+            for offsetG in offsetsG:
+                corner1 = flatTable[offsetR + offsetG + offsetsB[0]]
+                corner2 = flatTable[offsetR + offsetG + offsetsB[1]]
+                lines.append( mixArray(corner1, corner2, interpB) )
+            result.append( mixArray(lines[0], lines[1], interpG) )
+
+        return mixArray(result[0], result[1], interpR)
+    # lookup3DTrilinearArray
+
     # Tetrahedral interoplation, as described by:
     # http://www.filmlight.ltd.uk/pdf/whitepapers/FL-TL-TN-0057-SoftwareLib.pdf
     # http://blogs.mathworks.com/steve/2006/11/24/tetrahedral-interpolation-for-colorspace-conversion/
@@ -774,6 +1005,60 @@ class Array:
                     (fz)    * startPos[n111][2] )
 
         return rgbaBuffer
+
+    # Tetrahedral interpolation for an (N, 3) array of positions. 'table' is
+    # the result of get3DTable. Uses the same tetrahedra and weights as 
+    # lookup3DTetrahedral, selected with masks instead of branches. Each
+    # tetrahedron uses the n000 and n111 corners and two of the others.
+    def lookup3DTetrahedralArray(self, positions, table=None):
+        if table is None:
+            table = self.get3DTable(positions.dtype)
+        (indexLow, indexHigh, interp) = self.get3DIndicesArray(positions)
+        (dimensionR, dimensionG, dimensionB) = table.shape[:3]
+        flatTable = table.reshape(-1, 3)
+
+        # Rebind for consistency with Truelight paper
+        (fx, fy, fz) = (interp[:, 0], interp[:, 1], interp[:, 2])
+
+        # The six tetrahedra, in the order of the branches in lookup3DTetrahedral
+        xy = fx > fy
+        yz = fy > fz
+        xz = fx > fz
+        zy = fz > fy
+        zx = fz > fx
+        tetrahedra = [
+            xy & yz,
+            xy & ~yz & xz,
+            xy & ~yz & ~xz,
+            ~xy & zy,
+            ~xy & ~zy & zx,
+            ~xy & ~zy & ~zx]
+
+        # The two corners other than n000 and n111, as R, G, B offsets
+        cornerOffsets1 = [(1, 0, 0), (1, 0, 0), (0, 0, 1), (0, 0, 1), (0, 1, 0), (0, 1, 0)]
+        cornerOffsets2 = [(1, 1, 0), (1, 0, 1), (1, 0, 1), (0, 1, 1), (0, 1, 1), (1, 1, 0)]
+
+        # The weights for n000, the two other corners and n111 are the 
+        # differences between the sorted interpolation factors
+        (fmin, fmid, fmax) = np.hsplit(np.sort(interp, axis=1), 3)
+        weights = [1-fmax, fmax-fmid, fmid-fmin, fmin]
+
+        def cornerIndex(offsets):
+            index = 0
+            for (channel, stride) in enumerate([dimensionG*dimensionB, dimensionB, 1]):
+                channelOffsets = np.select(tetrahedra, [offset[channel] for offset in offsets])
+                index = index + np.where(channelOffsets, indexHigh[:, channel], indexLow[:, channel])*stride
+            return index
+
+        index000 = (indexLow[:, 0]*dimensionG + indexLow[:, 1])*dimensionB + indexLow[:, 2]
+        index111 = (indexHigh[:, 0]*dimensionG + indexHigh[:, 1])*dimensionB + indexHigh[:, 2]
+        corners = [index000, cornerIndex(cornerOffsets1), cornerIndex(cornerOffsets2), index111]
+
+        return (weights[0]*flatTable[corners[0]] + 
+                weights[1]*flatTable[corners[1]] + 
+                weights[2]*flatTable[corners[2]] + 
+                weights[3]*flatTable[corners[3]])
+    # lookup3DTetrahedralArray
 # Array
 
 
@@ -0,0 +1,216 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+The Academy / ASC Common LUT Format Sample Implementations are provided by the
+Academy under the following terms and conditions:
+
+Copyright © 2015 Academy of Motion Picture Arts and Sciences ("A.M.P.A.S.").
+Portions contributed by others as indicated. All rights reserved.
+
+A worldwide, royalty-free, non-exclusive right to copy, modify, create
+derivatives, and use, in source and binary forms, is hereby granted, subject to
+acceptance of this license. Performance of any of the aforementioned acts
+indicates acceptance to be bound by the following terms and conditions:
+
+* Copies of source code, in whole or in part, must retain the above copyright
+notice, this list of conditions and the Disclaimer of Warranty.
+
+* Use in binary form must retain the above copyright notice, this list of
+conditions and the Disclaimer of Warranty in the documentation and/or other
+materials provided with the distribution.
+
+* Nothing in this license shall be deemed to grant any rights to trademarks,
+copyrights, patents, trade secrets or any other intellectual property of
+A.M.P.A.S. or any contributors, except as expressly stated herein.
+
+* Neither the name "A.M.P.A.S." nor the name of any other contributors to this
+software may be used to endorse or promote products derivative of or based on
+this software without express prior written permission of A.M.P.A.S. or the
+contributors, as appropriate.
+
+This license shall be construed pursuant to the laws of the State of California,
+and any disputes related thereto shall be subject to the jurisdiction of the
+courts therein.
+
+Disclaimer of Warranty: THIS SOFTWARE IS PROVIDED BY A.M.P.A.S. AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+THE IMPLIED WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND
+NON-INFRINGEMENT ARE DISCLAIMED. IN NO EVENT SHALL A.M.P.A.S., OR ANY
+CONTRIBUTORS OR DISTRIBUTORS, BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+SPECIAL, EXEMPLARY, RESITUTIONARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE
+OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF
+ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+WITHOUT LIMITING THE GENERALITY OF THE FOREGOING, THE ACADEMY SPECIFICALLY
+DISCLAIMS ANY REPRESENTATIONS OR WARRANTIES WHATSOEVER RELATED TO PATENT OR
+OTHER INTELLECTUAL PROPERTY RIGHTS IN THE ACES CONTAINER REFERENCE
+IMPLEMENTATION, OR APPLICATIONS THEREOF, HELD BY PARTIES OTHER THAN A.M.P.A.S.,
+WHETHER DISCLOSED OR UNDISCLOSED.
+"""
+
+import os
+import sys
+import numpy as np
+
+from Common import precisions
+from ProcessList import ProcessList
+from ProcessNode import bitDepths, bitDepthSize
+from Comment import Description
+from Range import Range
+from LUT1D import LUT1D
+from LUT3D import LUT3D
+
+# Needed to make sure that lutFormats is in the sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from lutFormats import Sampling
+
+#
+# Baking a ProcessList into a shaper, 3D LUT and output 1D LUT
+#
+def createBakedProcessList(inBitDepth, 
+                           outBitDepth,
+                           samples,
+                           lutResolution1d3d1d,
+                           shaperIn,
+                           shaperOut):
+    (samples1dIn, 
+     inputMin, inputMax,
+     samples3d, 
+     samples1dOut,
+     outputMin, outputMax) = samples
+    (lutResolution1dIn, lutResolution3d, lutResolution1dOut) = lutResolution1d3d1d
+    (shaperInType, shaperInMin, shaperInMax) = shaperIn
+    (shaperOutType, shaperOutMin, shaperOutMax) = shaperOut
+
+    lutpns = []
+
+    # Normalize the input range
+    lut3dInBitDepth = inBitDepth
+    if inputMin != 0.0 or inputMax != bitDepthSize(inBitDepth):
+        rangepn = Range(inBitDepth, bitDepths["FLOAT32"], "baked_range", "baked_range")
+        rangepn.setMinInValue(inputMin)
+        rangepn.setMaxInValue(inputMax)
+        rangepn.setMinOutValue(0.0)
+        rangepn.setMaxOutValue(1.0)
+        lutpns.append(rangepn)
+        lut3dInBitDepth = bitDepths["FLOAT32"]
+
+    # Create the input shaper. Linear shapers are handled by the Range node.
+    if samples1dIn and shaperInType != 'linear':
+        lutpn = LUT1D(lut3dInBitDepth, bitDepths["FLOAT32"], "baked_lut1d_in", "baked_lut1d_in")
+        lutpn.setArray(3, samples1dIn)
+        lutpns.append(lutpn)
+        lut3dInBitDepth = bitDepths["FLOAT32"]
+
+    # Create the 3D LUT
+    if samples1dOut:
+        lut3dOutBitDepth = bitDepths["FLOAT32"]
+    else:
+        lut3dOutBitDepth = outBitDepth
+
+    lut3dpn = LUT3D(lut3dInBitDepth, lut3dOutBitDepth, "baked_lut3d", "baked_lut3d", 
+        interpolation='tetrahedral')
+    lut3dpn.setArray(list(lutResolution3d), list(np.ravel(samples3d)))
+    lutpns.append(lut3dpn)
+
+    # Create the output shaper
+    if samples1dOut:
+        lutpn = LUT1D(bitDepths["FLOAT32"], outBitDepth, "baked_lut1d_out", "baked_lut1d_out")
+        lutpn.setArray(3, samples1dOut)
+        lutpns.append(lutpn)
+
+    bakedProcessList = ProcessList()
+    for lutpn in lutpns:
+        bakedProcessList.addProcess(lutpn)
+
+    return bakedProcessList
+# createBakedProcessList
+
+def measureBakeError(processList, bakedProcessList, values):
+    expected = processList.processArray(values)[:, :3]
+    result = bakedProcessList.processArray(values)[:, :3]
+
+    # Skip values that the original ProcessList doesn't map to finite values
+    valid = np.all(np.isfinite(expected), axis=1)
+    errors = np.abs(result[valid] - expected[valid])
+
+    return (float(np.max(errors)), float(np.mean(errors)))
+# measureBakeError
+
+def bake(processList,
+         tolerance=1e-3,
+         shaperIn=None,
+         shaperOut=None,
+         lutResolution1d3d1d=[1024, 17, 1024],
+         maxLutResolution3d=65,
+         validationValues=None,
+         validationSamples=4096,
+         verbose=False):
+    inBitDepth = processList.getInBitDepth()
+    outBitDepth = processList.getOutBitDepth()
+
+    # Default to sampling the full range of the input bit depth
+    if shaperIn == None:
+        shaperIn = ['linear', 0.0, bitDepthSize(inBitDepth)]
+    if shaperOut == None:
+        shaperOut = [None, 0.0, 1.0]
+
+    # Default to random values, distributed evenly in the input shaper's space
+    if validationValues is None:
+        (shaperInType, shaperInMin, shaperInMax) = shaperIn
+        (shaperInPL, shaperInPLInverse, inputMin, inputMax) = Sampling.createShaper(
+            shaperInType, shaperInMin, shaperInMax)
+
+        shaperValues = np.random.RandomState(0).uniform(0.0, 1.0, (validationSamples, 3))
+        if shaperInType != None:
+            validationValues = shaperInPLInverse.processArray(shaperValues)
+        else:
+            validationValues = shaperValues
+
+    # Resolve the list of ProcessNodes once for all of the sampling passes.
+    # Samples are computed at reference precision.
+    plan = processList.compile(precisions["FLOAT64"])
+
+    (lutResolution1dIn, lutResolution3d, lutResolution1dOut) = lutResolution1d3d1d
+    while True:
+        resolution = [lutResolution1dIn, [lutResolution3d]*3, lutResolution1dOut]
+
+        samples = Sampling.sample1D3D1D(plan, resolution, shaperIn, shaperOut)
+        bakedProcessList = createBakedProcessList(inBitDepth, outBitDepth, 
+            samples, resolution, shaperIn, shaperOut)
+
+        (maxError, meanError) = measureBakeError(plan, bakedProcessList, validationValues)
+
+        if verbose:
+            print( "bake - resolution %d, %d, %d - max error : %3.6f, mean error : %3.6f" % (
+                lutResolution1dIn, lutResolution3d, lutResolution1dOut, maxError, meanError) )
+
+        if maxError <= tolerance or lutResolution3d >= maxLutResolution3d:
+            break
+
+        # Double the density of the LUTs. The 3D LUT keeps its existing samples.
+        lutResolution3d = min(2*lutResolution3d - 1, maxLutResolution3d)
+        lutResolution1dIn = min(2*lutResolution1dIn, 65536)
+        lutResolution1dOut = min(2*lutResolution1dOut, 65536)
+
+    if maxError > tolerance:
+        print( "bake - tolerance %3.6f not met at the maximum resolution. Max error : %3.6f" % (
+            tolerance, maxError) )
+
+    # Record the resolution and the error for the baked ProcessList
+    for (attribute, value) in [('id', processList.getID()), ('name', processList.getName())]:
+        if value != None:
+            bakedProcessList.setAttribute(attribute, 'Baked %s' % value)
+        else:
+            bakedProcessList.setAttribute(attribute, 'Baked ProcessList')
+    bakedProcessList.setCompCLFversion(1.0)
+    bakedProcessList.addElement( Description(
+        "Baked with LUT resolution %d, %d, %d. Max error : %3.9f, mean error : %3.9f" % (
+            lutResolution1dIn, lutResolution3d, lutResolution1dOut, maxError, meanError) ) )
+
+    return (bakedProcessList, maxError, meanError)
+# bake
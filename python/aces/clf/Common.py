@@ -75,11 +75,52 @@ def getFeatureCompatibility():
     global compatibility
     return compatibility
 
+#
+# Precisions used to store values between ProcessNodes when processing 
+# whole buffers
+#
+# FLOAT64 : Values are stored and computed as doubles. Each ProcessNode adds
+#           a relative rounding error of at most 2^-53 (~1.1e-16). Use for 
+#           reference renders and LUT baking.
+# FLOAT32 : The default. Each ProcessNode adds a relative rounding error of at
+#           most 2^-24 (~6.0e-8), which matches the per-pixel 'process' path.
+# FLOAT16 : Values are stored as half-floats and computed as floats. Each 
+#           ProcessNode adds a relative error of at most 2^-11 (~4.9e-4) for
+#           values between 2^-14 and 65504, and an absolute error of at most
+#           2^-25 (~3.0e-8) below that. Larger values become infinite. Halves
+#           the memory traffic of FLOAT32 for preview work.
+#
+# ProcessNodes without whole-buffer implementations, like LUT3D nodes with an
+# unsupported interpolation type, compute at float32 precision regardless of
+# the precision used to store values.
+#
+precisions = {
+    "FLOAT16" : "float16",
+    "FLOAT32" : "float32",
+    "FLOAT64" : "float64"
+}
+
+# The numpy type used to store values between ProcessNodes
+def precisionStorageType(precision):
+    return np.dtype(precision)
+
+# The numpy type used for computation within ProcessNodes
+def precisionComputeType(precision):
+    if precision == precisions["FLOAT16"]:
+        return np.dtype(np.float32)
+    else:
+        return np.dtype(precision)
+
 # Simple utility functions
 def clamp(value, minValue=0.0, maxValue=1.0):
     return min( maxValue, max( minValue, value ) )
 # clamp
 
+# Clamps an array of values. NaNs become minValue, as they do with clamp.
+def clampArray(values, minValue=0.0, maxValue=1.0):
+    return np.fmin( maxValue, np.fmax( minValue, values ) )
+# clampArray
+
 def mix(value1, value2, mixAmount):
     outValue = [0] * len(value1)
     for i in range(len(value1)):
@@ -87,6 +128,12 @@ def mix(value1, value2, mixAmount):
     return outValue
 # mix
 
+# True for a 3x4 affine transform that leaves values unchanged
+def isIdentityAffine(affine):
+    identity = np.hstack( [np.identity(3), np.zeros((3, 1))] )
+    return np.allclose(affine, identity, rtol=0.0, atol=1e-12)
+# isIdentityAffine
+
 # Utilities for bit-wise conversion between half-float, float, double and 
 # 16, 32 and 64 bit-integer representations
 def uint16ToHalf(uint16Value):
@@ -130,4 +177,33 @@ def doubleToHex(doubleValue):
     return struct.pack(">d", doubleValue).encode("hex")
 
 def hexToDouble(hex64Value):
-    return struct.unpack(">d", hex64Value.decode("hex"))[0]
\ No newline at end of file
+    return struct.unpack(">d", hex64Value.decode("hex"))[0]
+
+# The float type and the unsigned integer type of the same size used by each
+# Array floatEncoding
+floatEncodingTypes = {
+    'integer16bit' : (np.float16, np.uint16),
+    'integer32bit' : (np.float32, np.uint32),
+    'integer64bit' : (np.float64, np.uint64),
+    'hex16bit' : (np.float16, np.uint16),
+    'hex32bit' : (np.float32, np.uint32),
+    'hex64bit' : (np.float64, np.uint64)
+}
+
+# Bulk versions of the conversions above, for arrays of values. The hex 
+# digits are those of the big-endian representation, as with halfToHex.
+def floatsToUInts(values, floatType, uintType):
+    return np.ascontiguousarray(values, dtype=floatType).view(uintType)
+
+def uintsToFloats(values, floatType, uintType):
+    return np.ascontiguousarray(values, dtype=uintType).view(floatType)
+
+def floatsToHex(values, floatType):
+    bigEndianType = np.dtype(floatType).newbyteorder('>')
+    digits = 2*bigEndianType.itemsize
+    hexValues = np.ascontiguousarray(values, dtype=bigEndianType).tostring().encode("hex")
+    return [hexValues[i:i+digits] for i in range(0, len(hexValues), digits)]
+
+def hexToFloats(hexValues, floatType):
+    bigEndianType = np.dtype(floatType).newbyteorder('>')
+    return np.frombuffer("".join(hexValues).decode("hex"), dtype=bigEndianType).astype(floatType)
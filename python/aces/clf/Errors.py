@@ -30,3 +30,42 @@ class UnsupportedExtensionError(Error):
         self.msg = msg
     def __str__(self):
         return repr(self.msg)
+
+class UnsupportedPrecisionError(Error):
+    """Exception raised for processing precisions that are unknown or unsupported.
+
+    Attributes:
+        expr -- input expression in which the error occurred
+        msg  -- explanation of the error
+    """
+
+    def __init__(self, msg):
+        self.msg = msg
+    def __str__(self):
+        return repr(self.msg)
+
+class UnsupportedLayoutError(Error):
+    """Exception raised for pixel buffer layouts that are unknown or unsupported.
+
+    Attributes:
+        expr -- input expression in which the error occurred
+        msg  -- explanation of the error
+    """
+
+    def __init__(self, msg):
+        self.msg = msg
+    def __str__(self):
+        return repr(self.msg)
+
+class InvalidArrayError(Error):
+    """Exception raised for Array elements whose values don't match their dimensions.
+
+    Attributes:
+        expr -- input expression in which the error occurred
+        msg  -- explanation of the error
+    """
+
+    def __init__(self, msg):
+        self.msg = msg
+    def __str__(self):
+        return repr(self.msg)
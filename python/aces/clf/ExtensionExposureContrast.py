@@ -52,12 +52,18 @@ IMPLEMENTATION, OR APPLICATIONS THEREOF, HELD BY PARTIES OTHER THAN A.M.P.A.S.,
 WHETHER DISCLOSED OR UNDISCLOSED.
 """
 
+import math
+
 from ProcessNode import *
 
 #
 # Autodesk extensions
 #
 
+# The names of the DynamicParameters that ExposureContrast nodes respond to,
+# and the index of the corresponding value in the ECParams
+dynamicParamIndices = {'EXPOSURE':0, 'CONTRAST':1, 'PIVOT':2}
+
 class ExposureContrast(ProcessNode):
     "A Common LUT Format ExposureContrast ProcessNode element"
 
@@ -71,6 +77,24 @@ class ExposureContrast(ProcessNode):
 
     def setExposureContrastPivot(self, exposure, contrast, pivot ):
         self._params[0] = [exposure, contrast, pivot]
+    def getExposureContrastPivot(self):
+        return tuple(self._params[0])
+
+    # The parameters are read each time values are processed, so changes 
+    # also apply to nodes that have already been prepared or compiled
+    def setExposure(self, exposure):
+        self._params[0][0] = exposure
+    def setContrast(self, contrast):
+        self._params[0][1] = contrast
+    def setPivot(self, pivot):
+        self._params[0][2] = pivot
+
+    # Dynamic Parameters
+    def setDynamicParamValue(self, name, value):
+        if self.getDynamicParam(name) and name in dynamicParamIndices:
+            self._params[0][dynamicParamIndices[name]] = value
+            return 1
+        return 0
 
     # Read / Write
     def write(self, tree):
@@ -100,6 +124,24 @@ class ExposureContrast(ProcessNode):
         return None
     # readChild
 
+    # The gain or offset, contrast and pivot used by each style, derived 
+    # from the current exposure, contrast and pivot. The linear and video 
+    # styles compute pivot*pow(max(0, value*gain), contrast). The log style 
+    # computes (value + offset)*contrast + pivot.
+    def getStyleParameters(self, style):
+        (exposure, contrast, pivot) = self._params[0]
+
+        if style == 'linear':
+            return (pow(2.0, exposure)/pivot, contrast, pivot)
+        elif style == 'video':
+            return (pow(pow(2.0, exposure)/pivot, 1.0/1.83), contrast, pow(pivot, 1.0/1.83))
+        elif style == 'log':
+            logPivot = (0.6/2.046*math.log10(pivot/0.9) + 685.0/1023.0)
+            return (exposure*0.6/2.046*math.log10(2.0) - logPivot, contrast, logPivot)
+        else:
+            return None
+    # getStyleParameters
+
     def process(self, values, stride=0, verbose=False):
         # Base attributes
         inBitDepth = self._attributes['inBitDepth']
@@ -110,19 +152,12 @@ class ExposureContrast(ProcessNode):
         if 'style' in self._attributes: style = self._attributes['style']
 
         # Node parameters
-        exposure = 0.0
-        contrast = 1.0
-        pivot = 1.0
-
-        for param in self._params:
-            exposure = param[0]
-            contrast = param[1]
-            pivot = param[2]
+        parameters = self.getStyleParameters(style)
 
         '''
-        print( "exposure      : %s" % exposure )
-        print( "contrast      : %s" % contrast )
-        print( "pivot         : %s" % pivot )
+        print( "exposure      : %s" % self._params[0][0] )
+        print( "contrast      : %s" % self._params[0][1] )
+        print( "pivot         : %s" % self._params[0][2] )
         '''
 
         # Handle processing of single values
@@ -136,34 +171,27 @@ class ExposureContrast(ProcessNode):
             value = values[p*stride:(p+1)*stride]
             outValue = values[p*stride:(p+1)*stride]
 
-            if style == 'linear':
-                for i in range(3):
-                    outValue[i] = bitDepthToNormalized(outValue[i], inBitDepth)
-
-                    outValue[i] = pivot*pow(max(0.0,(pow(2.0,exposure)*outValue[i]/pivot)), contrast)
-
-                    outValue[i] = normalizedToBitDepth(outValue[i], outBitDepth)
-
-            elif style == 'video':
+            if style == 'linear' or style == 'video':
+                (gain, contrast, pivot) = parameters
                 for i in range(3):
                     outValue[i] = bitDepthToNormalized(outValue[i], inBitDepth)
 
-                    outValue[i] = pow(pivot,1.0/1.83)*pow(max(0.0,(outValue[i]*pow(pow(2.0,exposure)/pivot),1.0/1.83)), contrast)
+                    outValue[i] = pivot*pow(max(0.0, outValue[i]*gain), contrast)
 
                     outValue[i] = normalizedToBitDepth(outValue[i], outBitDepth)
 
             elif style == 'log':
+                (offset, contrast, pivot) = parameters
                 for i in range(3):
                     outValue[i] = bitDepthToNormalized(outValue[i], inBitDepth)
 
-                    p = (0.6/2.046*math.log10(pivot/0.9) + 685.0/1023.0)
-                    outValue[i] = (outValue[i] + exposure*0.6/2.046*math.log10(2.0) - p)*contrast + p
+                    outValue[i] = (outValue[i] + offset)*contrast + pivot
 
                     outValue[i] = normalizedToBitDepth(outValue[i], outBitDepth)
 
             # Copy the extra channels
             for i in range(min(3, stride),stride):
-                outValue[i] = values[i]
+                outValue[i] = value[i]
 
             # Copy to the output array
             outValues[p*stride:(p+1)*stride] = outValue
@@ -171,6 +199,43 @@ class ExposureContrast(ProcessNode):
         return outValues
     # process
 
+    def prepare(self, precision=precisions["FLOAT32"]):
+        # Base attributes
+        inBitDepth = self._attributes['inBitDepth']
+        outBitDepth = self._attributes['outBitDepth']
+
+        # Node attributes
+        style = ''
+        if 'style' in self._attributes: style = self._attributes['style']
+
+        computeType = precisionComputeType(precision)
+        inSize = bitDepthSize(inBitDepth)
+        outSize = bitDepthSize(outBitDepth)
+
+        def kernel(values, out):
+            # Node parameters, read for each buffer. See setExposure
+            parameters = self.getStyleParameters(style)
+            normalized = np.asarray(values, computeType)/inSize
+
+            if style == 'linear' or style == 'video':
+                (gain, contrast, pivot) = parameters
+                result = pivot*np.power(np.fmax(0.0, normalized*gain), contrast)
+
+            elif style == 'log':
+                (offset, contrast, pivot) = parameters
+                result = (normalized + offset)*contrast + pivot
+
+            # Unknown styles leave values unchanged
+            else:
+                out[...] = values
+                return out
+
+            out[...] = result*outSize
+            return out
+
+        return kernel
+    # prepare
+
     def printInfoChild(self):
         #print( "ExposureContrast" )
 
@@ -181,7 +246,7 @@ class ExposureContrast(ProcessNode):
         print( "\tPivot     : %s" % param[2] )
         '''
 
-        values = {"exposure":param[0], "contrast":param[0], "pivot":param[2]}
+        values = {"exposure":param[0], "contrast":param[1], "pivot":param[2]}
 
         for key, value in values.iteritems():
             print( "%20s : %15s : %15s" % ("Value", key, value) )
@@ -67,10 +67,50 @@ class Gamma(ProcessNode):
         ProcessNode.__init__(self, 'Gamma', inBitDepth, outBitDepth, id, name)
         self._attributes['style'] = style
         self._params = []
+        self.updateParameters()
     # __init__
 
     def setGamma(self, gamma, offset=0.0, channel=None ):
         self._params.append([gamma, offset, channel])
+        self.updateParameters()
+
+    # Derives the per-channel gamma and offset from the GammaParams, along 
+    # with the break points and linear segment slopes of the moncurve styles
+    def updateParameters(self):
+        gamma = [1.0, 1.0, 1.0]
+        offset = [0.0, 0.0, 0.0]
+
+        channels = {'R':0, 'G':1, 'B':2}
+        for param in self._params:
+            if param[2] == None:
+                gamma = [param[0], param[0], param[0]]
+                offset = [param[1], param[1], param[1]]
+            else:
+                channel = channels[param[2]]
+                gamma[channel] = param[0]
+                offset[channel] = param[1]
+
+        fwdBreakPoint = [float('-inf')] * 3
+        fwdSlope = [0.0, 0.0, 0.0]
+        revBreakPoint = [float('-inf')] * 3
+        revSlope = [0.0, 0.0, 0.0]
+
+        # The moncurves only have a linear segment with a positive offset 
+        # and a gamma above 1. Otherwise the power segment is used throughout
+        for i in range(3):
+            if offset[i] > 0.0 and gamma[i] > 1.0:
+                fwdBreakPoint[i] = offset[i]/(gamma[i]-1.0)
+                revBreakPoint[i] = pow(gamma[i]*offset[i]/((gamma[i]-1.0)*(offset[i]+1.0)), gamma[i])
+                fwdSlope[i] = (gamma[i]-1.0)/offset[i]*pow(gamma[i]*offset[i]/((gamma[i]-1.0)*(offset[i]+1.0)), gamma[i])
+                revSlope[i] = pow((gamma[i]-1.0)/offset[i], gamma[i]-1.0)*pow((1.0 + offset[i])/gamma[i], gamma[i])
+
+        self._gamma = gamma
+        self._offset = offset
+        self._fwdBreakPoint = fwdBreakPoint
+        self._fwdSlope = fwdSlope
+        self._revBreakPoint = revBreakPoint
+        self._revSlope = revSlope
+    # updateParameters
 
     # Read / Write
     def write(self, tree):
@@ -99,6 +139,7 @@ class Gamma(ProcessNode):
                 elif key == 'channel':
                     param[2] = value
             self._params.append(param)
+            self.updateParameters()
         return None
     # readChild
 
@@ -112,19 +153,8 @@ class Gamma(ProcessNode):
         if 'style' in self._attributes: style = self._attributes['style']
 
         # Node parameters
-        gamma = [1.0, 1.0, 1.0]
-        offset = [0.0, 0.0, 0.0]
-
-        params = self._params
-        channels = {'R':0, 'G':1, 'B':2}
-        for param in self._params:
-            if param[2] == None:
-                gamma = [param[0], param[0], param[0]]
-                offset = [param[1], param[1], param[1]]
-            else:
-                channel = channels[param[2]]
-                gamma[channel] = param[0]
-                offset[channel] = param[1]
+        gamma = self._gamma
+        offset = self._offset
 
         '''
         print( "gamma      : %s" % gamma )
@@ -158,9 +188,8 @@ class Gamma(ProcessNode):
                 for i in range(3):
                     outValue[i] = bitDepthToNormalized(outValue[i], inBitDepth)
 
-                    pivot = (offset[i]/(gamma[i]-1))
-                    if( outValue[i] <= pivot ):
-                        outValue[i] = (gamma[i]-1.0)/offset[i]*pow(gamma[i]*offset[i]/((gamma[i]-1.0)*(offset[i]+1.0)), gamma[i])*outValue[i]
+                    if( outValue[i] <= self._fwdBreakPoint[i] ):
+                        outValue[i] = self._fwdSlope[i]*outValue[i]
                     else:
                         outValue[i] = pow(max(0.0, (outValue[i] + offset[i])/(offset[i] + 1.0)), gamma[i])
 
@@ -170,9 +199,8 @@ class Gamma(ProcessNode):
                 for i in range(3):
                     outValue[i] = bitDepthToNormalized(outValue[i], inBitDepth)
 
-                    pivot = pow( gamma[i]*offset[i]/((gamma[i]-1.0)*(offset[i]+1.0)) , gamma[i])
-                    if( outValue[i] <= (offset[i]/(gamma[i]-1)) ):
-                        outValue[i] = pow((gamma[i]-1.0)/offset[i], gamma[i]-1.0)*pow((1.0 + offset[i])/gamma[i], gamma[i])*outValue[i]
+                    if( outValue[i] <= self._revBreakPoint[i] ):
+                        outValue[i] = self._revSlope[i]*outValue[i]
                     else:
                         outValue[i] = pow(max(0.0, outValue[i]), 1.0/gamma[i])*(1.0 + offset[i]) - offset[i]
 
@@ -188,23 +216,65 @@ class Gamma(ProcessNode):
         return outValues
     # process
 
-    def printInfoChild(self):
-        #print( "Gamma" )
-        gamma = [1.0, 1.0, 1.0]
-        offset = [0.0, 0.0, 0.0]
+    def prepare(self, precision=precisions["FLOAT32"]):
+        # Base attributes
+        inBitDepth = self._attributes['inBitDepth']
+        outBitDepth = self._attributes['outBitDepth']
 
-        params = self._params
-        channels = {'R':0, 'G':1, 'B':2}
-        for param in self._params:
-            if param[2] == None:
-                gamma = [param[0], param[0], param[0]]
-                offset = [param[1], param[1], param[1]]
+        # Node attributes
+        style = ''
+        if 'style' in self._attributes: style = self._attributes['style']
+
+        # Node parameters, as per-channel vectors
+        computeType = precisionComputeType(precision)
+        gamma = np.array(self._gamma, dtype=computeType)
+        inverseGamma = np.array([1.0/x for x in self._gamma], dtype=computeType)
+        offset = np.array(self._offset, dtype=computeType)
+        fwdBreakPoint = np.array(self._fwdBreakPoint, dtype=computeType)
+        fwdSlope = np.array(self._fwdSlope, dtype=computeType)
+        revBreakPoint = np.array(self._revBreakPoint, dtype=computeType)
+        revSlope = np.array(self._revSlope, dtype=computeType)
+
+        inSize = bitDepthSize(inBitDepth)
+        outSize = bitDepthSize(outBitDepth)
+
+        def kernel(values, out):
+            c = values.shape[1]
+            normalized = np.asarray(values, computeType)/inSize
+
+            if style == 'basicFwd':
+                result = np.power(np.fmax(0.0, normalized), gamma[:c])
+
+            elif style == 'basicRev':
+                result = np.power(np.fmax(0.0, normalized), inverseGamma[:c])
+
+            # NaNs take the power segment and map to zero, as in process
+            elif style == 'moncurveFwd':
+                with np.errstate(invalid='ignore'):
+                    result = np.where(normalized <= fwdBreakPoint[:c],
+                        fwdSlope[:c]*normalized,
+                        np.power(np.fmax(0.0, (normalized + offset[:c])/(offset[:c] + 1.0)), gamma[:c]))
+
+            elif style == 'moncurveRev':
+                with np.errstate(invalid='ignore'):
+                    result = np.where(normalized <= revBreakPoint[:c],
+                        revSlope[:c]*normalized,
+                        np.power(np.fmax(0.0, normalized), inverseGamma[:c])*(1.0 + offset[:c]) - offset[:c])
+
+            # Unknown styles leave values unchanged
             else:
-                channel = channels[param[2]]
-                gamma[channel] = param[0]
-                offset[channel] = param[1]
+                out[...] = values
+                return out
+
+            out[...] = result*outSize
+            return out
 
-        values = {"gamma":gamma, "offset":offset}
+        return kernel
+    # prepare
+
+    def printInfoChild(self):
+        #print( "Gamma" )
+        values = {"gamma":self._gamma, "offset":self._offset}
 
         for key, value in values.iteritems():
             print( "%20s : %15s : %15s" % ("Value", key, value) )
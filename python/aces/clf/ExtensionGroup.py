@@ -53,7 +53,8 @@ WHETHER DISCLOSED OR UNDISCLOSED.
 """
 
 from ProcessNode import *
-from ProcessList import ProcessList
+from ProcessList import ProcessList, ProcessPlan, compileProcesses, optimizeProcesses, removeDeadProcesses
+from Profile import ProcessProfile, profileProcess
 
 class Group(ProcessNode):
     "A Common LUT Format Group ProcessNode element"
@@ -62,6 +63,7 @@ class Group(ProcessNode):
         "%s - Initialize the standard class variables" % 'Group'
         ProcessNode.__init__(self, 'Group', inBitDepth, outBitDepth, id, name)
         self._processes = []
+        self._profile = None
 
         # Remove in and out bit depth attributes
         # XXX Ignoring for now. Should be revisited when discussed by the project committee
@@ -123,7 +125,10 @@ class Group(ProcessNode):
             #print( "processing : %s" % result )
 
             if processNode.getAttribute('bypass') == None:
-                result = processNode.process(result, stride, verbose=verbose)
+                if self._profile != None:
+                    result = profileProcess(self._profile, processNode, result, stride, verbose=verbose)
+                else:
+                    result = processNode.process(result, stride, verbose=verbose)
                 if verbose:
                     print( "Group - %s (%s) - result value : %s" % 
                         (processNode.getAttribute('name'), processNode.getNodeType(), 
@@ -145,7 +150,10 @@ class Group(ProcessNode):
                                 processNode.getAttribute('name'), processNode.getNodeType(), inBitDepth, outBitDepth))
 
                         RangeAdapter = RangeClass(inBitDepth, outBitDepth, "adapter", "adapter", style='noClamp')
-                        result = RangeAdapter.process(result, stride, verbose=verbose)
+                        if self._profile != None:
+                            result = profileProcess(self._profile, RangeAdapter, result, stride, verbose=verbose)
+                        else:
+                            result = RangeAdapter.process(result, stride, verbose=verbose)
                         if verbose:
                             print( "%s (%s) - result value : %s, result type : %s" % 
                                 (RangeAdapter.getAttribute('name'), RangeAdapter.getNodeType(), 
@@ -155,6 +163,68 @@ class Group(ProcessNode):
         return result
     # process
 
+    def processArray(self, values, out=None, verbose=False):
+        return self.compile().processPixels(values, out, verbose=verbose)
+    # processArray
+
+    def compile(self, precision=precisions["FLOAT32"]):
+        return ProcessPlan(compileProcesses(self._processes, checkFeatureCompatibility=False, 
+            precision=precision), precision, self._profile)
+    # compile
+
+    # Profiling. See ProcessList.setProfiling
+    def setProfiling(self, profiling):
+        if profiling:
+            if self._profile == None:
+                self._profile = ProcessProfile()
+        else:
+            self._profile = None
+
+        for processNode in self._processes:
+            if isinstance(processNode, ProcessList.getClass("Group")):
+                processNode.setProfiling(profiling)
+    def getProfiling(self):
+        return self._profile != None
+    def getProfile(self):
+        if self._profile != None:
+            return self._profile.getReport()
+        return None
+    def resetProfile(self):
+        if self._profile != None:
+            self._profile.reset()
+        for processNode in self._processes:
+            if isinstance(processNode, ProcessList.getClass("Group")):
+                processNode.resetProfile()
+
+    # Dynamic Parameters. See ProcessList.setDynamicParamValue
+    def setDynamicParamValue(self, name, value):
+        return sum([processNode.setDynamicParamValue(name, value) for processNode in self._processes])
+
+    def prepare(self, precision=precisions["FLOAT32"]):
+        return self.compile(precision).processPixels
+    # prepare
+
+    def getProcessedChannels(self):
+        return max([3] + [processNode.getProcessedChannels() for processNode in self._processes])
+    # getProcessedChannels
+
+    def optimize(self, verbose=False):
+        (self._processes, removed) = optimizeProcesses(self._processes, verbose=verbose)
+        return removed
+    # optimize
+
+    def removeDeadNodes(self, verbose=False):
+        (self._processes, removed) = removeDeadProcesses(self._processes, 
+            checkFeatureCompatibility=False, verbose=verbose)
+        return removed
+    # removeDeadNodes
+
+    # Empty Groups leave values unchanged
+    def isIdentity(self):
+        return (len(self._processes) == 0 and 
+            self.getInBitDepth() == self.getOutBitDepth())
+    # isIdentity
+
     def printInfoChild(self):
         # Process Nodes
         print( "Process Nodes")
@@ -56,6 +56,10 @@ import math
 
 from ProcessNode import *
 
+# The smallest normalized 32 bit float. Values are clamped to this before 
+# taking their log
+FLOAT_MIN = 1.1754943508222875 * pow(10,-38)
+
 #
 # Autodesk extensions
 #
@@ -69,10 +73,53 @@ class Log(ProcessNode):
         ProcessNode.__init__(self, 'Log', inBitDepth, outBitDepth, id, name)
         self._attributes['style'] = style
         self._params = []
+        self.updateParameters()
     # __init__
 
     def setLogParams(self, gamma=0.6, refWhite=685, refBlack=95, highlight=1.0, shadow=0.0, channel=None ):
         self._params.append([gamma, refWhite, refBlack, highlight, shadow, channel])
+        self.updateParameters()
+
+    # Derives the per-channel parameters from the LogParams, along with the
+    # linear reference black and gain used by the logToLin and linToLog styles
+    def updateParameters(self):
+        gamma = [0.6, 0.6, 0.6]
+        refWhite = [685.0, 685.0, 685.0]
+        refBlack = [95.0, 95.0, 95.0]
+        highlight = [1.0, 1.0, 1.0]
+        shadow = [0.0, 0.0, 0.0]
+
+        params = self._params
+        channels = {'R':0, 'G':1, 'B':2}
+        for param in self._params:
+            if param[5] == None:
+                gamma = [param[0], param[0], param[0]]
+                refWhite = [param[1], param[1], param[1]]
+                refBlack = [param[2], param[2], param[2]]
+                highlight = [param[3], param[3], param[3]]
+                shadow = [param[4], param[4], param[4]]
+            else:
+                channel = channels[param[5]]
+                gamma[channel] = param[0]
+                refWhite[channel] = param[1]
+                refBlack[channel] = param[2]
+                highlight[channel] = param[3]
+                shadow[channel] = param[4]
+
+        linearRefBlack = [0.0, 0.0, 0.0]
+        gain = [0.0, 0.0, 0.0]
+        for i in range(3):
+            linearRefBlack[i] = pow(10.0, min(-0.00001, (refBlack[i]-refWhite[i])*0.002/gamma[i]))
+            gain[i] = (highlight[i] - shadow[i])/(1.0 - linearRefBlack[i])
+
+        self._gamma = gamma
+        self._refWhite = refWhite
+        self._refBlack = refBlack
+        self._highlight = highlight
+        self._shadow = shadow
+        self._linearRefBlack = linearRefBlack
+        self._gain = gain
+    # updateParameters
 
     # Read / Write
     def write(self, tree):
@@ -109,6 +156,7 @@ class Log(ProcessNode):
                 elif key == 'channel':
                     param[5] = value
             self._params.append(param)
+            self.updateParameters()
         return None
     # readChild
 
@@ -122,28 +170,13 @@ class Log(ProcessNode):
         if 'style' in self._attributes: style = self._attributes['style']
 
         # Node parameters
-        gamma = [0.6, 0.6, 0.6]
-        refWhite = [685.0, 685.0, 685.0]
-        refBlack = [95.0, 95.0, 95.0]
-        highlight = [1.0, 1.0, 1.0]
-        shadow = [0.0, 0.0, 0.0]
-
-        params = self._params
-        channels = {'R':0, 'G':1, 'B':2}
-        for param in self._params:
-            if param[5] == None:
-                gamma = [param[0], param[0], param[0]]
-                refWhite = [param[1], param[1], param[1]]
-                refBlack = [param[2], param[2], param[2]]
-                highlight = [param[3], param[3], param[3]]
-                shadow = [param[4], param[4], param[4]]
-            else:
-                channel = channels[param[5]]
-                gamma[channel] = param[0]
-                refWhite[channel] = param[1]
-                refBlack[channel] = param[2]
-                highlight[channel] = param[3]
-                shadow[channel] = param[4]
+        gamma = self._gamma
+        refWhite = self._refWhite
+        refBlack = self._refBlack
+        highlight = self._highlight
+        shadow = self._shadow
+        linearRefBlack = self._linearRefBlack
+        gain = self._gain
 
         '''
         print( "gamma      : %s" % gamma )
@@ -153,8 +186,6 @@ class Log(ProcessNode):
         print( "shadow     : %s" % shadow )
         '''
 
-        FLOAT_MIN = 1.1754943508222875 * pow(10,-38)
-
         # Handle processing of single values
         if stride == 0:
             stride = len(values)
@@ -200,24 +231,18 @@ class Log(ProcessNode):
 
             elif style == 'logToLin':
                 for i in range(3):
-                    linearRefBlack = pow(10.0, min(-0.00001, (refBlack[i]-refWhite[i])*0.002/gamma[i]))
-                    gain = (highlight[i] - shadow[i])/(1.0 - linearRefBlack)
-
                     outValue[i] = bitDepthToNormalized(outValue[i], inBitDepth)
 
                     relativeExposure = pow(10.0, (1023.0*outValue[i] - refWhite[i])*0.002/gamma[i])
-                    outValue[i] = (relativeExposure - linearRefBlack)*gain + shadow[i]
+                    outValue[i] = (relativeExposure - linearRefBlack[i])*gain[i] + shadow[i]
 
                     outValue[i] = normalizedToBitDepth(outValue[i], outBitDepth)
 
             elif style == 'linToLog':
                 for i in range(3):
-                    linearRefBlack = pow(10.0, min(-0.00001, (refBlack[i]-refWhite[i])*0.002/gamma[i]))
-                    gain = (highlight[i] - shadow[i])/(1.0 - linearRefBlack)
-
                     outValue[i] = bitDepthToNormalized(outValue[i], inBitDepth)
 
-                    relativeExposure = linearRefBlack + (outValue[i] - shadow[i])/gain
+                    relativeExposure = linearRefBlack[i] + (outValue[i] - shadow[i])/gain[i]
                     outValue[i] = (refWhite[i] + math.log10(max(FLOAT_MIN, relativeExposure))*gamma[i]/0.002)/1023.0
 
                     outValue[i] = normalizedToBitDepth(outValue[i], outBitDepth)
@@ -232,30 +257,71 @@ class Log(ProcessNode):
         return outValues
     # process
 
+    def prepare(self, precision=precisions["FLOAT32"]):
+        # Base attributes
+        inBitDepth = self._attributes['inBitDepth']
+        outBitDepth = self._attributes['outBitDepth']
+
+        # Node attributes
+        style = ''
+        if 'style' in self._attributes: style = self._attributes['style']
+
+        # Node parameters, as per-channel vectors
+        computeType = precisionComputeType(precision)
+        gamma = np.array(self._gamma, dtype=computeType)
+        refWhite = np.array(self._refWhite, dtype=computeType)
+        shadow = np.array(self._shadow, dtype=computeType)
+        linearRefBlack = np.array(self._linearRefBlack, dtype=computeType)
+        gain = np.array(self._gain, dtype=computeType)
+
+        inSize = bitDepthSize(inBitDepth)
+        outSize = bitDepthSize(outBitDepth)
+
+        def kernel(values, out):
+            c = values.shape[1]
+            normalized = np.asarray(values, computeType)/inSize
+
+            # NaNs stay NaNs through the log styles, as with max in process,
+            # but linToLog clamps them to FLOAT_MIN
+            with np.errstate(over='ignore'):
+                if style == 'log10':
+                    result = np.log10(np.maximum(normalized, FLOAT_MIN))
+
+                elif style == 'log2':
+                    result = np.log2(np.maximum(normalized, FLOAT_MIN))
+
+                elif style == 'antiLog10':
+                    result = np.power(10.0, normalized)
+
+                elif style == 'antiLog2':
+                    result = np.power(2.0, normalized)
+
+                elif style == 'logToLin':
+                    relativeExposure = np.power(10.0, (1023.0*normalized - refWhite[:c])*0.002/gamma[:c])
+                    result = (relativeExposure - linearRefBlack[:c])*gain[:c] + shadow[:c]
+
+                elif style == 'linToLog':
+                    relativeExposure = linearRefBlack[:c] + (normalized - shadow[:c])/gain[:c]
+                    result = (refWhite[:c] + np.log10(np.fmax(FLOAT_MIN, relativeExposure))*gamma[:c]/0.002)/1023.0
+
+                # Unknown styles leave values unchanged
+                else:
+                    out[...] = values
+                    return out
+
+            out[...] = result*outSize
+            return out
+
+        return kernel
+    # prepare
+
     def printInfoChild(self):
         #print( "Log" )
-        gamma = [0.6, 0.6, 0.6]
-        refWhite = [685.0, 685.0, 685.0]
-        refBlack = [95.0, 95.0, 95.0]
-        highlight = [1.0, 1.0, 1.0]
-        shadow = [0.0, 0.0, 0.0]
-
-        params = self._params
-        channels = {'R':0, 'G':1, 'B':2}
-        for param in self._params:
-            if param[5] == None:
-                gamma = [param[0], param[0], param[0]]
-                refWhite = [param[1], param[1], param[1]]
-                refBlack = [param[2], param[2], param[2]]
-                highlight = [param[3], param[3], param[3]]
-                shadow = [param[4], param[4], param[4]]
-            else:
-                channel = channels[param[5]]
-                gamma[channel] = param[0]
-                refWhite[channel] = param[1]
-                refBlack[channel] = param[2]
-                highlight[channel] = param[3]
-                shadow[channel] = param[4]
+        gamma = self._gamma
+        refWhite = self._refWhite
+        refBlack = self._refBlack
+        highlight = self._highlight
+        shadow = self._shadow
 
         '''
         print( "\tGamma      : %s" % gamma )
@@ -143,6 +143,31 @@ class Reference(ProcessNode):
         return outValues
     # process
 
+    def processArray(self, values, out=None, verbose=False):
+        if self._processList != None:
+            outValues = self._processList.processArray(values, out, verbose=verbose)
+        elif out is None:
+            outValues = values
+        else:
+            out[...] = values
+            outValues = out
+        return outValues
+    # processArray
+
+    def getProcessedChannels(self):
+        if self._processList != None:
+            return max([3] + [processNode.getProcessedChannels() for processNode in self._processList])
+        else:
+            return 3
+    # getProcessedChannels
+
+    def prepare(self, precision=precisions["FLOAT32"]):
+        if self._processList != None:
+            return self._processList.compile(precision).processPixels
+        else:
+            return self.processArray
+    # prepare
+
     def printInfoChild(self):
         print( "%20s : %15s" % ("Resolved Path", self._resolvedPath) )
         if self._processList != None:
@@ -69,6 +69,7 @@ class IndexMap:
         self._elementType = elementType
         self._useCachedProcess = useCachedProcess
         self._processCached = None
+        self._createPointArrays()
 
         if self._useCachedProcess and self._values != [] and self._dimension != []:
             self._createCachedProcess()
@@ -81,8 +82,9 @@ class IndexMap:
 
     def setValues(self, values):
         self._values = values
+        self._createPointArrays()
         if self._useCachedProcess and self._values != [] and self._dimension != []:
-            self._createCachedEval()
+            self._createCachedProcess()
     def getValues(self):
         return self._values
 
@@ -91,10 +93,24 @@ class IndexMap:
     def getUseCachedProcessue(self):
         return self._useCachedProcess
 
+    # The input and output points as arrays, sorted by input value, for 
+    # binary searches
+    def _createPointArrays(self):
+        if len(self._values) == 2:
+            inputPoints = np.array(self._values[0], dtype=np.float64)
+            outputPoints = np.array(self._values[1], dtype=np.float64)
+            order = np.argsort(inputPoints, kind='mergesort')
+            self._inputPoints = inputPoints[order]
+            self._outputPoints = outputPoints[order]
+        else:
+            self._inputPoints = None
+            self._outputPoints = None
+    # _createPointArrays
+
     # evaluation and caching
     def _processRaw(self, value, verbose=False):
-        inputValues = self._values[0]
-        outputValues = self._values[1]
+        inputValues = self._inputPoints
+        outputValues = self._outputPoints
 
         # NaNs
         if np.isnan(value):
@@ -113,43 +129,64 @@ class IndexMap:
         elif value >= inputValues[-1]:
             result = outputValues[-1]
 
-        # Within the input range
+        # Within the input range. Find the first input point at or above
+        # the value
         else:
-            for i in range(len(inputValues)):
-                if value <= inputValues[i+1]:
-                    inputLow = inputValues[i]
-                    inputHigh = inputValues[i+1]
-                    interp = (value - inputLow)/(inputHigh - inputLow)
-                    outputLow = outputValues[i]
-                    outputHigh = outputValues[i+1]
-                    result = interp*(outputHigh - outputLow) + outputLow
-                    break
+            i = np.searchsorted(inputValues, value, side='left') - 1
+            inputLow = inputValues[i]
+            inputHigh = inputValues[i+1]
+            interp = (value - inputLow)/(inputHigh - inputLow)
+            outputLow = outputValues[i]
+            outputHigh = outputValues[i+1]
+            result = interp*(outputHigh - outputLow) + outputLow
         return result
-    # process
+    # _processRaw
+
+    # Evaluates an array of values with the same rules as _processRaw. NaNs 
+    # and Infs pass through and values outside of the input range are 
+    # clamped to the first or last output point. Returns float64 values.
+    def processArray(self, values):
+        inputValues = self._inputPoints
+        outputValues = self._outputPoints
+        values = np.asarray(values, dtype=np.float64)
+
+        # A single point maps every number to its output
+        if len(inputValues) == 1:
+            return np.where(np.isfinite(values), outputValues[0], values)
+
+        # Indices of the input points below and above each value. Values 
+        # outside of the input range are handled below
+        high = np.clip(np.searchsorted(inputValues, values, side='left'), 1, len(inputValues)-1)
+        low = high - 1
+
+        inputLow = inputValues[low]
+        inputHigh = inputValues[high]
+        outputLow = outputValues[low]
+        outputHigh = outputValues[high]
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            interp = (values - inputLow)/(inputHigh - inputLow)
+            result = interp*(outputHigh - outputLow) + outputLow
+
+            result = np.where(values <= inputValues[0], outputValues[0], result)
+            result = np.where(values >= inputValues[-1], outputValues[-1], result)
+
+        # NaNs and Infs
+        return np.where(np.isfinite(values), result, values)
+    # processArray
 
     # _createCachedEval
     def _createCachedProcess(self):
         channels = 1
         resolution = 65536
-        cacheValues = [0.0]*resolution
-
-        for i in range(resolution):
-            # Figure out which half value corresponds to the specific 16 bit integer value
-            sample = uint16ToHalf(i)
 
-            # Apply the function to the sample value
-            # Should take the channel as input, or process an RGB triple
-            fvalue = self._processRaw(sample)
-
-            # Store the values
-            for c in range(channels):
-                cacheIndex = i*channels + c
-                cacheValues[cacheIndex] = fvalue
-                #print( "%d, %d, %d: %f -> %f" % (i, c, lutValueIndex, sample, fvalue))
+        # Every half value, in the order of their 16 bit integer representations
+        samples = np.arange(resolution, dtype=np.uint16).view(np.float16)
+        cacheValues = list(self.processArray(samples))
 
         dimensions = [len(cacheValues), channels]
         self._processCached = Array(dimensions, cacheValues)
-    # _createCachedEval
+    # _createCachedProcess
 
     # Read / Write
     def write(self, tree):
@@ -171,6 +208,7 @@ class IndexMap:
         self._values = []
         self._values.append( map(lambda p: float(p.split('@')[0]), element.text.split()) )
         self._values.append( map(lambda p: float(p.split('@')[1]), element.text.split()) )
+        self._createPointArrays()
     # read
 
     # Process values
@@ -209,3 +247,20 @@ class IndexMap:
     # printInfo
 # IndexMap
 
+#
+# Maps each channel of an (N, C) array of values through one IndexMap, or 
+# one IndexMap per channel, and normalizes the results by the LUT dimension 
+# for that channel. Matches the per-value handling of IndexMaps in LUT1D and
+# LUT3D.
+#
+def indexMapPositionsArray(indexMaps, values, dimensions, dtype):
+    positions = np.empty(values.shape, dtype=dtype)
+    for c in range(values.shape[1]):
+        if len(indexMaps) > 1:
+            indexMap = indexMaps[c]
+        else:
+            indexMap = indexMaps[0]
+        positions[:, c] = indexMap.processArray(values[:, c])/float(dimensions[c]-1)
+    return positions
+# indexMapPositionsArray
+
@@ -54,7 +54,7 @@ WHETHER DISCLOSED OR UNDISCLOSED.
 
 from ProcessNode import *
 from Array import Array
-from IndexMap import IndexMap
+from IndexMap import IndexMap, indexMapPositionsArray
 from Common import uint16ToHalf, halfToUInt16
 
 class LUT1D(ProcessNode):
@@ -212,6 +212,46 @@ class LUT1D(ProcessNode):
 
         return outValues
     # process
+
+    def prepare(self, precision=precisions["FLOAT32"]):
+        interpolation = ''
+        if 'interpolation' in self._attributes: interpolation = self._attributes['interpolation']
+        halfDomain = not (self.getAttribute('halfDomain') in [None, False])
+
+        computeType = precisionComputeType(precision)
+        inBitDepth = self._attributes['inBitDepth']
+        indexMaps = self._indexMaps
+        array = self._array
+        dimensions = [self.getLUTDimensions()[0]]*3
+
+        # Cubic interpolation takes precedence over halfDomain, as in process
+        if interpolation == 'cubic' and array.getCubicCoefficients() is not None:
+            table = array.getCubicCoefficients().astype(computeType)
+            lookup = array.lookup1DCubicArray
+        elif interpolation == 'cubic':
+            table = array.get1DTable(computeType)
+            lookup = array.lookup1DLinearArray
+        elif halfDomain:
+            # Interpolate using the type of the LUT values, if it's more 
+            # precise, as the per-pixel implementation does
+            tableType = np.result_type(computeType, np.asarray(array.getValues()).dtype)
+            table = array.get1DTable(tableType)
+            lookup = array.lookup1DHalfDomainArray
+        else:
+            table = array.get1DTable(computeType)
+            lookup = array.lookup1DLinearArray
+
+        def kernel(values, out):
+            # Index Maps replace the bit-depth normalization
+            if len(indexMaps) > 0:
+                positions = indexMapPositionsArray(indexMaps, values, dimensions, computeType)
+            else:
+                positions = bitDepthToNormalized(np.asarray(values, computeType), inBitDepth)
+            out[...] = lookup(positions, table)
+            return out
+
+        return kernel
+    # prepare
 # LUT1D
 
 #
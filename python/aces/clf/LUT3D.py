@@ -54,7 +54,7 @@ WHETHER DISCLOSED OR UNDISCLOSED.
 
 from ProcessNode import *
 from Array import Array
-from IndexMap import IndexMap
+from IndexMap import IndexMap, indexMapPositionsArray
 
 class LUT3D(ProcessNode):
     "A Common LUT Format LUT 3D ProcessNode element"
@@ -194,6 +194,36 @@ class LUT3D(ProcessNode):
 
         return outValues
     # process
+
+    def prepare(self, precision=precisions["FLOAT32"]):
+        interpolation = ''
+        if 'interpolation' in self._attributes: interpolation = self._attributes['interpolation']
+
+        # Other interpolation types use the per-pixel implementation
+        if not interpolation in ['trilinear', 'tetrahedral']:
+            return self.processArray
+
+        computeType = precisionComputeType(precision)
+        inBitDepth = self._attributes['inBitDepth']
+        indexMaps = self._indexMaps
+        dimensions = self.getLUTDimensions()
+        table = self._array.get3DTable(computeType)
+        if interpolation == 'trilinear':
+            lookup = self._array.lookup3DTrilinearArray
+        else:
+            lookup = self._array.lookup3DTetrahedralArray
+
+        def kernel(values, out):
+            # Index Maps replace the bit-depth normalization
+            if len(indexMaps) > 0:
+                positions = indexMapPositionsArray(indexMaps, values, dimensions, computeType)
+            else:
+                positions = bitDepthToNormalized(np.asarray(values, computeType), inBitDepth)
+            out[...] = lookup(positions, table)
+            return out
+
+        return kernel
+    # prepare
 # LUT3D
 
 #
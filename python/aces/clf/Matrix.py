@@ -137,6 +137,62 @@ class Matrix(ProcessNode):
 
         return outValues
     # process
+
+    # The matrix values as a (rows, columns) array
+    def getMatrixArray(self, dtype=np.float64):
+        dimensions = self._array.getDimensions()
+        matrix = np.array(self._array.getValues(), dtype=dtype)
+        return matrix[:dimensions[0]*dimensions[1]].reshape(dimensions[0], dimensions[1])
+    # getMatrixArray
+
+    def prepare(self, precision=precisions["FLOAT32"]):
+        dimensions = self._array.getDimensions()
+        matrix = self.getMatrixArray(precisionComputeType(precision))
+
+        # Pixels are rows, so they're multiplied by the transposed matrix
+        transposed = np.ascontiguousarray(matrix[:, :dimensions[0]].T)
+        if dimensions[1] == dimensions[0]+1:
+            offset = matrix[:, dimensions[0]].copy()
+        else:
+            offset = None
+
+        def kernel(values, out):
+            result = np.dot(np.asarray(values, transposed.dtype), transposed)
+            if offset is not None:
+                result += offset
+            out[...] = result
+            return out
+
+        return kernel
+    # prepare
+
+    def getProcessedChannels(self):
+        return self._array.getDimensions()[0]
+    # getProcessedChannels
+
+    def getAffine(self):
+        dimensions = self._array.getDimensions()
+
+        # Matrices that touch the alpha channel can't be folded into a 3x4
+        if dimensions[0] != 3 or not dimensions[1] in [3, 4]:
+            return None
+
+        affine = np.zeros((3, 4), dtype=np.float64)
+        affine[:, :dimensions[1]] = self.getMatrixArray()
+        return affine
+    # getAffine
+
+    # Handles the 4x4 and 4x5 matrices that getAffine doesn't describe
+    def isIdentity(self):
+        dimensions = self._array.getDimensions()
+        matrix = self.getMatrixArray()
+
+        identity = np.zeros((dimensions[0], dimensions[1]), dtype=np.float64)
+        identity[:, :dimensions[0]] = np.identity(dimensions[0])
+
+        return (self.getInBitDepth() == self.getOutBitDepth() and
+            np.allclose(matrix, identity, rtol=0.0, atol=1e-12))
+    # isIdentity
 # Matrix
 
 
@@ -57,9 +57,12 @@ import gzip
 import numpy as np
 import sys
 import xml.etree.ElementTree as etree
+from multiprocessing.pool import ThreadPool
 
-from Common import getFeatureCompatibility, featureSets
+from Common import getFeatureCompatibility, featureSets, precisions, precisionStorageType, isIdentityAffine
 import Errors
+from Array import ArrayElement
+from Profile import ProcessProfile, profileProcess, timer
 
 class ProcessList:
     "A Common LUT Format ProcessList element"
@@ -75,6 +78,53 @@ class ProcessList:
         return prettyString
     #xmlPrettify
 
+    # Writes the same text as xmlPrettify to a file object, without building
+    # the whole document as a string first. The text of Array elements is 
+    # written in chunks as it's formatted.
+    @staticmethod
+    def xmlWrite(document, fp, indent="", addIndent="\t", newLine="\n"):
+        def escape(data):
+            if isinstance(data, unicode):
+                data = data.encode('UTF-8')
+            return data.replace("&", "&amp;").replace("<", "&lt;").replace(
+                "\"", "&quot;").replace(">", "&gt;")
+
+        def writeElement(element, indent):
+            fp.write(indent + "<" + element.tag)
+            for key in sorted(element.keys()):
+                fp.write(" %s=\"%s\"" % (key, escape(element.get(key))))
+
+            children = list(element)
+
+            # Array text is written as it's formatted
+            if isinstance(element, ArrayElement):
+                textChunks = element.iterTextChunks()
+            elif element.text:
+                textChunks = [element.text]
+            else:
+                textChunks = []
+
+            if len(children) == 0 and textChunks == []:
+                fp.write("/>" + newLine)
+                return
+
+            fp.write(">")
+            if len(children) == 0:
+                for chunk in textChunks:
+                    fp.write(escape(chunk))
+            else:
+                fp.write(newLine)
+                if element.text:
+                    fp.write(escape(indent + addIndent + element.text + newLine))
+                for child in children:
+                    writeElement(child, indent + addIndent)
+                fp.write(indent)
+            fp.write("</%s>%s" % (element.tag, newLine))
+
+        fp.write('<?xml version="1.0" ?>' + newLine)
+        writeElement(document.getroot(), indent)
+    #xmlWrite
+
     # ProcessNode registry
     serializableClasses = {}
 
@@ -92,15 +142,21 @@ class ProcessList:
         else:
             return None
 
-    def __init__(self, clfPath=None, strict=False):
+    # removeDeadNodes=True removes bypassed and identity ProcessNodes after
+    # reading. See removeDeadNodes.
+    def __init__(self, clfPath=None, strict=False, removeDeadNodes=False):
         "%s - Initialize the standard class variables" % 'ProcessList'
         self._attributes = {}
         self._valueElements = {}
         self._elements = []
         self._processes = []
+        self._precision = precisions["FLOAT32"]
+        self._profile = None
         
         if clfPath != None:
             self.readFile(clfPath, strict)
+            if removeDeadNodes:
+                self.removeDeadNodes()
     # __init__
 
     def __iter__(self):
@@ -153,9 +209,8 @@ class ProcessList:
         # Writing Gzipped XML data
         if writeGzip:
             if getFeatureCompatibility() & featureSets["Duiker Research"]:
-                prettyString = self.xmlPrettify(document, clfPath)
                 f = gzip.open(clfPath, 'wb')
-                f.write(prettyString)
+                self.xmlWrite(document, f)
                 f.close()
             else:
                 msg = "Unsupported feature : write gzipped file"
@@ -168,9 +223,8 @@ class ProcessList:
             #document.write(scriptPath)
             
             # Pretty saving to to disk
-            prettyString = self.xmlPrettify(document, clfPath)
             fp = open(clfPath, 'wb')
-            fp.write(prettyString)
+            self.xmlWrite(document, fp)
             fp.close()
 
         return True
@@ -311,6 +365,14 @@ class ProcessList:
         else:
             return None
 
+    # The precision used for whole-buffer processing. See Common.precisions
+    def setPrecision(self, precision):
+        if not precision in precisions.values():
+            raise Errors.UnsupportedPrecisionError("Unsupported precision : %s" % precision)
+        self._precision = precision
+    def getPrecision(self):
+        return self._precision
+
     # Elements
     def addElement(self, element):
         if element != None:
@@ -341,7 +403,19 @@ class ProcessList:
         return None
 
     # Color processing
-    def process(self, values, stride=0, verbose=False):
+    #
+    # When 'out' is specified, the results are written to 'out' and 'out' is
+    # returned. See processArray for the use of 'out', 'layout' and 'threads'.
+    def process(self, values, stride=0, verbose=False, out=None, layout='interleaved', threads=1):
+        # Whole images and lists of pixels are processed as a single buffer
+        if isinstance(values, np.ndarray) and values.ndim > 1:
+            return self.processArray(values, out, verbose=verbose, layout=layout, threads=threads)
+
+        # Flat buffers with an output buffer, or using more than one thread,
+        # are processed as a single buffer
+        if out is not None or threads > 1:
+            return self.compile().process(values, stride, verbose=verbose, out=out, threads=threads)
+
         # Cast all values to float32 for processing
         result = np.array(values, np.float32)
 
@@ -356,7 +430,10 @@ class ProcessList:
             # Process the current value using the ProcessNode
             if (processNode.getAttribute('bypass') == None or
                 not(getFeatureCompatibility() & featureSets["Autodesk"]) ):
-                result = processNode.process(result, stride, verbose=verbose)
+                if self._profile != None:
+                    result = profileProcess(self._profile, processNode, result, stride, verbose=verbose)
+                else:
+                    result = processNode.process(result, stride, verbose=verbose)
                 if verbose:
                     print( "%s (%s) - result value : %s, result type : %s" % 
                         (processNode.getAttribute('name'), processNode.getNodeType(), 
@@ -386,7 +463,10 @@ class ProcessList:
                                 processNode.getAttribute('name'), processNode.getNodeType(), inBitDepth, outBitDepth))
 
                         RangeAdapter = RangeClass(inBitDepth, outBitDepth, "adapter", "adapter", style='noClamp')
-                        result = RangeAdapter.process(result, verbose=verbose)
+                        if self._profile != None:
+                            result = profileProcess(self._profile, RangeAdapter, result, stride, verbose=verbose)
+                        else:
+                            result = RangeAdapter.process(result, stride, verbose=verbose)
                         if verbose:
                             print( "%s (%s) - result value : %s, result type : %s" % 
                                 (RangeAdapter.getAttribute('name'), RangeAdapter.getNodeType(), 
@@ -396,6 +476,123 @@ class ProcessList:
         return result
     # process
 
+    # Whole-buffer color processing
+    #
+    # 'values' is an array of pixels with C channels, using one of the 
+    # layouts described with getPixelView. (N, C) and (H, W, C) arrays use the
+    # 'interleaved' layout. (C, N) and (C, H, W) arrays use the 'planar' 
+    # layout. The result has the same shape as 'values'.
+    #
+    # 'out' is an optional, contiguous array with the same number of values as
+    # 'values'. The results are written into 'out', which may be 'values'
+    # itself to process in place. No buffers other than 'values' and 'out'
+    # are used between ProcessNodes.
+    #
+    # Only the channels used by the ProcessNodes, usually red, green and 
+    # blue, are processed. Alpha and other channels are left untouched when
+    # processing in place and copied once otherwise.
+    #
+    # With 'threads' greater than 1, the pixels are split into chunks of
+    # about processChunkBytes. The chunks are run through all of the
+    # ProcessNodes on a pool of threads and written into 'out'.
+    def processArray(self, values, out=None, verbose=False, layout='interleaved', threads=1):
+        return self.compile().processArray(values, out, verbose=verbose, layout=layout, threads=threads)
+    # processArray
+
+    # Resolve bypassed nodes, feature compatibility and bit-depth adapters 
+    # once, for use with repeated calls to process or processArray. Uses the
+    # ProcessList's precision by default.
+    def compile(self, precision=None):
+        if precision == None:
+            precision = self._precision
+        return ProcessPlan(compileProcesses(self._processes, precision=precision), precision,
+            self._profile)
+    # compile
+
+    # Profiling
+    #
+    # When enabled, the time spent in each ProcessNode, the number of calls,
+    # the pixels processed and the bytes read and allocated are recorded by
+    # process, processArray and the ProcessPlans created by compile. Enabling
+    # profiling also enables it for the Groups in the ProcessList. See 
+    # Profile.ProcessProfile for the report format.
+    def setProfiling(self, profiling):
+        if profiling:
+            if self._profile == None:
+                self._profile = ProcessProfile()
+        else:
+            self._profile = None
+
+        for processNode in self._processes:
+            if isinstance(processNode, ProcessList.getClass("Group")):
+                processNode.setProfiling(profiling)
+    def getProfiling(self):
+        return self._profile != None
+    def getProfile(self):
+        if self._profile != None:
+            return self._profile.getReport()
+        return None
+    def getProfileJSON(self, indent=2):
+        if self._profile != None:
+            return self._profile.getJSON(indent)
+        return None
+    def resetProfile(self):
+        if self._profile != None:
+            self._profile.reset()
+        for processNode in self._processes:
+            if isinstance(processNode, ProcessList.getClass("Group")):
+                processNode.resetProfile()
+    def printProfile(self):
+        if self._profile != None:
+            self._profile.printInfo()
+
+    # Dynamic Parameters
+    #
+    # Sets the value of a DynamicParameter, like 'EXPOSURE' or 'CONTRAST', on
+    # every ProcessNode that has it, including those in Groups. The new value 
+    # is used by ProcessPlans that have already been compiled, so a frame can
+    # be re-rendered without reading or compiling the ProcessList again.
+    # Returns the number of ProcessNodes updated.
+    def setDynamicParamValue(self, name, value):
+        return sum([processNode.setDynamicParamValue(name, value) for processNode in self._processes])
+
+    # Remove bypassed ProcessNodes and ProcessNodes that leave values 
+    # unchanged, including those in Groups. Range nodes are added only where
+    # bypassed nodes sat between different bit depths. Returns the number of
+    # ProcessNodes removed.
+    def removeDeadNodes(self, verbose=False):
+        (self._processes, removed) = removeDeadProcesses(self._processes, verbose=verbose)
+        return removed
+    # removeDeadNodes
+
+    # Fold runs of affine ProcessNodes into single Matrix nodes and remove
+    # identity nodes, including those in Groups. Returns the number of
+    # ProcessNodes removed.
+    def optimize(self, verbose=False):
+        (self._processes, removed) = optimizeProcesses(self._processes, 
+            keepOneNode=True, verbose=verbose)
+        return removed
+    # optimize
+
+    # Bake the ProcessList into an equivalent ProcessList made of a shaper,
+    # a LUT3D and an optional output LUT1D. The LUT resolution is increased
+    # until the maximum error on the validation values is below 'tolerance'.
+    # Shapers are specified as [type, min, max], as in lutFormats.Sampling.
+    # Returns the baked ProcessList, the maximum error and the mean error.
+    def bake(self, 
+             tolerance=1e-3,
+             shaperIn=None,
+             shaperOut=None,
+             lutResolution1d3d1d=[1024, 17, 1024],
+             maxLutResolution3d=65,
+             validationValues=None,
+             verbose=False):
+        # Imported here as the lutFormats module imports this module
+        import Bake
+        return Bake.bake(self, tolerance, shaperIn, shaperOut, lutResolution1d3d1d,
+            maxLutResolution3d, validationValues, verbose=verbose)
+    # bake
+
     # Print information
     def printInfo(self):
         print( "ProcessList" )
@@ -423,6 +620,352 @@ class ProcessList:
     # printInfo
 # ProcessList
 
+#
+# Resolving bypassed ProcessNodes
+#
+# Returns the list of ProcessNodes that are run. Bypassed nodes are dropped
+# and Range nodes are added to adapt between mismatched bit depths. Group
+# nodes don't check the feature set before honoring the 'bypass' attribute,
+# which is what checkFeatureCompatibility=False is used for.
+#
+def resolveBypassedProcesses(processes, checkFeatureCompatibility=True):
+    resolved = []
+
+    honorBypass = (not checkFeatureCompatibility or
+        (getFeatureCompatibility() & featureSets["Autodesk"]))
+
+    for i in range(len(processes)):
+        processNode = processes[i]
+
+        # Keep the ProcessNode
+        if processNode.getAttribute('bypass') == None or not honorBypass:
+            resolved.append(processNode)
+
+        # Bypass this ProcessNode, handling bit-depth mismatches
+        elif i > 0 and i < (len(processes)-1):
+            inBitDepth = processes[i-1].getOutBitDepth()
+            outBitDepth = processes[i+1].getInBitDepth()
+
+            if inBitDepth != outBitDepth:
+                RangeClass = ProcessList.serializableClasses['Range']
+                RangeAdapter = RangeClass(inBitDepth, outBitDepth, "adapter", "adapter", style='noClamp')
+                resolved.append(RangeAdapter)
+
+    return resolved
+# resolveBypassedProcesses
+
+#
+# Compiling a list of ProcessNodes
+#
+# Returns the list of (ProcessNode, kernel) pairs to run
+#
+def compileProcesses(processes, checkFeatureCompatibility=True, precision=precisions["FLOAT32"]):
+    return [(processNode, processNode.prepare(precision)) 
+        for processNode in resolveBypassedProcesses(processes, checkFeatureCompatibility)]
+# compileProcesses
+
+#
+# Removing ProcessNodes that don't change values
+#
+# Bypassed nodes are replaced by the Range nodes that adapt between bit 
+# depths, if needed, and identity nodes are removed. The first and last nodes
+# are kept if removing them would change the list's input or output bit 
+# depth. They don't change values in either case.
+#
+# Returns the remaining list of ProcessNodes and the number of nodes removed.
+#
+def removeDeadProcesses(processes, checkFeatureCompatibility=True, verbose=False):
+    GroupClass = ProcessList.serializableClasses['Group']
+
+    removed = 0
+
+    # Remove nodes from Groups first, so empty Groups can be removed
+    for processNode in processes:
+        if isinstance(processNode, GroupClass):
+            removed += processNode.removeDeadNodes(verbose=verbose)
+
+    remaining = [processNode for processNode in 
+        resolveBypassedProcesses(processes, checkFeatureCompatibility) 
+        if not processNode.isIdentity()]
+
+    # Keep the bit depths at either end of the list
+    if len(processes) > 0:
+        if len(remaining) == 0 or remaining[0].getInBitDepth() != processes[0].getInBitDepth():
+            remaining.insert(0, processes[0])
+        if remaining[-1].getOutBitDepth() != processes[-1].getOutBitDepth():
+            remaining.append(processes[-1])
+
+    for processNode in processes:
+        if not any(processNode is remainingNode for remainingNode in remaining):
+            if verbose:
+                print( "removeDeadNodes - removing %s (%s)" % 
+                    (processNode.getAttribute('name'), processNode.getNodeType()) )
+            removed += 1
+
+    return (remaining, removed)
+# removeDeadProcesses
+
+#
+# Optimizing a list of ProcessNodes
+#
+# Runs of adjacent ProcessNodes that act as affine transforms on the color
+# channels, like 3x3 and 3x4 Matrix nodes and non-clamping Range nodes, are
+# replaced by a single 3x4 Matrix. Runs that amount to an identity transform
+# are removed. Bypassed nodes are left alone. Alpha values may differ from
+# the original list, as the Matrix node doesn't touch the alpha channel.
+#
+# Returns the optimized list of ProcessNodes and the number of nodes removed.
+# keepOneNode=True prevents a ProcessList from ending up with no nodes, and
+# so no bit depths.
+#
+def getFoldableAffine(processNode):
+    if processNode.getAttribute('bypass') != None:
+        return None
+    return processNode.getAffine()
+# getFoldableAffine
+
+def fuseProcesses(processes, affine):
+    MatrixClass = ProcessList.serializableClasses['Matrix']
+    DescriptionClass = ProcessList.serializableClasses['Description']
+
+    fused = MatrixClass(processes[0].getInBitDepth(), processes[-1].getOutBitDepth(), 
+        processes[0].getAttribute('id'), processes[0].getAttribute('name'))
+    fused.addElement( DescriptionClass("Combination of ProcessNodes : %s" % 
+        ", ".join(map(lambda x: "%s (%s)" % (x.getAttribute('name'), x.getNodeType()), processes))) )
+    fused.setMatrix([3, 4, 3], list(affine.ravel()))
+    return fused
+# fuseProcesses
+
+def optimizeProcesses(processes, keepOneNode=False, verbose=False):
+    GroupClass = ProcessList.serializableClasses['Group']
+    optimized = []
+    removed = 0
+
+    i = 0
+    while i < len(processes):
+        processNode = processes[i]
+
+        # Optimize the contents of Groups
+        if isinstance(processNode, GroupClass):
+            removed += processNode.optimize(verbose=verbose)
+
+        affine = getFoldableAffine(processNode)
+        if affine is None:
+            optimized.append(processNode)
+            i += 1
+            continue
+
+        # Gather the run of affine ProcessNodes, composing their transforms
+        run = [processNode]
+        transform = np.vstack( [affine, [0.0, 0.0, 0.0, 1.0]] )
+        i += 1
+        while i < len(processes):
+            affine = getFoldableAffine(processes[i])
+            if affine is None:
+                break
+            run.append(processes[i])
+            transform = np.dot(np.vstack( [affine, [0.0, 0.0, 0.0, 1.0]] ), transform)
+            i += 1
+        affine = transform[:3]
+
+        isIdentity = (run[0].getInBitDepth() == run[-1].getOutBitDepth() and
+            isIdentityAffine(affine))
+
+        if isIdentity and not (keepOneNode and len(run) == len(processes)):
+            if verbose:
+                print( "optimize - removing identity ProcessNodes : %s" % 
+                    ", ".join(map(lambda x: x.getAttribute('name'), run)) )
+            removed += len(run)
+        elif len(run) == 1:
+            optimized.append(run[0])
+        else:
+            if verbose:
+                print( "optimize - combining ProcessNodes : %s" % 
+                    ", ".join(map(lambda x: x.getAttribute('name'), run)) )
+            optimized.append( fuseProcesses(run, affine) )
+            removed += len(run) - 1
+
+    return (optimized, removed)
+# optimizeProcesses
+
+#
+# Pixel layouts for whole-buffer processing
+#
+# interleaved : Channels are the last dimension, as in (N, C) or (H, W, C)
+# planar      : Channels are the first dimension, as in (C, N) or (C, H, W)
+#
+# Returns a (N, C) view of the pixels in 'values'. Raises an error if 'values'
+# can't be viewed that way without copying.
+#
+def getPixelView(values, channels, layout='interleaved'):
+    # Setting the shape raises an error if a copy would be needed
+    view = values.view()
+    if layout == 'interleaved':
+        view.shape = (-1, channels)
+        return view
+    elif layout == 'planar':
+        view.shape = (channels, -1)
+        return view.T
+    else:
+        raise Errors.UnsupportedLayoutError("Unsupported layout : %s" % layout)
+# getPixelView
+
+# Buffers processed with more than one thread are split into chunks of about
+# this many bytes, so that each chunk stays in the processor's cache as it
+# goes through the kernels
+processChunkBytes = 256*1024
+
+class ProcessPlan(object):
+    "A compiled, read-only list of the ProcessNode kernels for a ProcessList"
+
+    __slots__ = ['_steps', '_precision', '_channels', '_profile']
+
+    # 'profile' is an optional Profile.ProcessProfile that records the time
+    # spent in each kernel
+    def __init__(self, steps, precision=precisions["FLOAT32"], profile=None):
+        object.__setattr__(self, '_steps', tuple(steps))
+        object.__setattr__(self, '_precision', precision)
+        object.__setattr__(self, '_profile', profile)
+        object.__setattr__(self, '_channels', 
+            tuple([processNode.getProcessedChannels() for (processNode, kernel) in steps]))
+    # __init__
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ProcessPlan objects can not be modified")
+
+    def __iter__(self):
+        return iter(self._steps)
+
+    def __len__(self):
+        return len(self._steps)
+
+    def getProcesses(self):
+        return [step[0] for step in self._steps]
+
+    def getPrecision(self):
+        return self._precision
+
+    # Color processing, one or more pixels stored in a flat list of values
+    def process(self, values, stride=0, verbose=False, out=None, layout='interleaved', threads=1):
+        # Whole images and lists of pixels are processed as a single buffer
+        if isinstance(values, np.ndarray) and values.ndim > 1:
+            return self.processArray(values, out, verbose=verbose, layout=layout, threads=threads)
+
+        # Flat buffers with an output buffer, or using more than one thread,
+        # are processed as a single buffer
+        if out is not None or threads > 1:
+            if stride == 0:
+                stride = len(values)
+            if out is None:
+                out = np.empty(len(values), precisionStorageType(self._precision))
+            return self.processArray(np.reshape(values, (-1, stride)), out, 
+                verbose=verbose, threads=threads)
+
+        # Cast all values to float32 for processing
+        result = np.array(values, np.float32)
+
+        for (processNode, kernel) in self._steps:
+            if self._profile != None:
+                result = profileProcess(self._profile, processNode, result, stride, verbose=verbose)
+            else:
+                result = processNode.process(result, stride, verbose=verbose)
+
+        return result
+    # process
+
+    # Whole-buffer color processing
+    # 
+    # See ProcessList.processArray for the use of 'out', 'layout' and 'threads'.
+    def processArray(self, values, out=None, verbose=False, layout='interleaved', threads=1):
+        values = np.asarray(values)
+        if layout == 'planar':
+            channels = values.shape[0]
+        else:
+            channels = values.shape[-1]
+
+        # View images as a list of pixels. Values are only copied if they
+        # need to be cast to the storage type for the plan's precision
+        storageType = precisionStorageType(self._precision)
+        pixels = getPixelView(np.ascontiguousarray(values, storageType), channels, layout)
+
+        if out is None:
+            out = np.empty(values.shape, storageType)
+        outPixels = getPixelView(out, channels, layout)
+
+        if verbose:
+            print( "Processing %d pixels. Channels: %d" % (pixels.shape[0], pixels.shape[1]) )
+
+        if threads > 1:
+            self.processPixelsThreaded(pixels, outPixels, threads, verbose=verbose)
+        else:
+            self.processPixels(pixels, outPixels, verbose=verbose)
+
+        return out
+    # processArray
+
+    # Runs processPixels on chunks of 'pixels' using a pool of threads. 
+    # Each thread writes its chunks into 'out'.
+    def processPixelsThreaded(self, pixels, out, threads, verbose=False):
+        chunkSize = max(1, processChunkBytes//(pixels.shape[1]*pixels.itemsize))
+        chunks = [(start, min(start + chunkSize, pixels.shape[0])) 
+            for start in range(0, pixels.shape[0], chunkSize)]
+
+        def processChunk(chunk):
+            (start, end) = chunk
+            self.processPixels(pixels[start:end], out[start:end], verbose=verbose)
+
+        if verbose:
+            print( "Processing %d chunks of %d pixels using %d threads" % 
+                (len(chunks), chunkSize, threads) )
+
+        if len(chunks) < 2:
+            for chunk in chunks:
+                processChunk(chunk)
+        else:
+            pool = ThreadPool(min(threads, len(chunks)))
+            try:
+                pool.map(processChunk, chunks)
+            finally:
+                pool.close()
+                pool.join()
+
+        return out
+    # processPixelsThreaded
+
+    # Runs each kernel on a (N, C) float array, without reshaping. The first
+    # kernel reads 'pixels' and writes 'out'. The others process 'out' in place.
+    # Each kernel only sees the channels its ProcessNode uses.
+    def processPixels(self, pixels, out=None, verbose=False):
+        if out is None:
+            out = np.empty(pixels.shape, precisionStorageType(self._precision))
+
+        inPlace = np.may_share_memory(pixels, out)
+        if len(self._steps) == 0 and not inPlace:
+            out[...] = pixels
+
+        source = pixels
+        for ((processNode, kernel), channels) in zip(self._steps, self._channels):
+            # Copy the channels that aren't processed to the output, once
+            if not inPlace:
+                out[:, channels:] = source[:, channels:]
+                inPlace = True
+
+            if self._profile != None:
+                start = timer()
+                kernel(source[:, :channels], out[:, :channels])
+                self._profile.record(processNode, timer() - start, out.shape[0],
+                    out.shape[0]*channels*out.itemsize)
+            else:
+                kernel(source[:, :channels], out[:, :channels])
+            source = out
+            if verbose:
+                print( "%s (%s) - processed %d pixels" %
+                    (processNode.getAttribute('name'), processNode.getNodeType(), out.shape[0]) )
+
+        return out
+    # processPixels
+# ProcessPlan
+
 #
 # Metaclass for nodes that will register with ProcessList
 #
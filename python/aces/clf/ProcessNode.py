@@ -54,6 +54,7 @@ WHETHER DISCLOSED OR UNDISCLOSED.
 
 import sys
 import os
+import numpy as np
 
 import xml.etree.ElementTree as etree
 
@@ -298,6 +299,11 @@ class ProcessNode():
     def getDynamicParam(self, name):
         return (name in self._dynamicParams)
 
+    # Sets the value of a DynamicParameter, if the node has that 
+    # DynamicParameter and supports it. Returns the number of nodes updated.
+    def setDynamicParamValue(self, name, value):
+        return 0
+
     # Node values
     def getNodeType(self):
         return self._nodeType
@@ -306,7 +312,61 @@ class ProcessNode():
     def process(self, values, stride=0, verbose=False):
         if verbose:
             print( "ProcessNode::process - no op")
-        return value
+        return values
+
+    # Whole-buffer color processing
+    #
+    # 'values' is a 2D array with one row per pixel and one column per channel.
+    # Subclasses override this method with array implementations. The default
+    # runs the per-pixel 'process' method over the flattened buffer.
+    #
+    # When 'out' is specified, the results are written to 'out' and 'out' is
+    # returned. 'out' has the same shape as 'values' and may be 'values'
+    # itself, so implementations must support processing in place.
+    def processArray(self, values, out=None, verbose=False):
+        (pixels, channels) = values.shape
+
+        # The per-pixel implementations may write into their input
+        flatValues = np.array(values, dtype=np.float32).reshape(pixels*channels)
+
+        outValues = self.process(flatValues, channels, verbose=verbose)
+
+        if out is None:
+            return np.reshape(outValues, (pixels, channels))
+
+        out[...] = np.reshape(outValues, (pixels, channels))
+        return out
+    # processArray
+
+    # The number of channels, starting with red, that the node reads or 
+    # writes. Whole-buffer processing leaves the other channels untouched.
+    def getProcessedChannels(self):
+        return 3
+    # getProcessedChannels
+
+    # Used by ProcessList.compile. Returns the function that processes
+    # whole buffers with this node. Subclasses can precompute values here,
+    # using the compute type for 'precision'. The function is called as 
+    # kernel(values, out) and follows the same rules as processArray.
+    def prepare(self, precision=precisions["FLOAT32"]):
+        return self.processArray
+    # prepare
+
+    # Used by ProcessList.optimize. Returns a 3x4 numpy array describing the
+    # operation applied to the first three channels as an affine transform,
+    # or None if the operation isn't affine.
+    def getAffine(self):
+        return None
+    # getAffine
+
+    # Used by ProcessList.removeDeadNodes. True if the node leaves values and
+    # their bit depth unchanged.
+    def isIdentity(self):
+        affine = self.getAffine()
+        return (affine is not None and 
+            self.getInBitDepth() == self.getOutBitDepth() and
+            isIdentityAffine(affine))
+    # isIdentity
 
     # Setters and getters
     def setInBitDepth(self, name):
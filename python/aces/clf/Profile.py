@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+The Academy / ASC Common LUT Format Sample Implementations are provided by the
+Academy under the following terms and conditions:
+
+Copyright © 2015 Academy of Motion Picture Arts and Sciences ("A.M.P.A.S.").
+Portions contributed by others as indicated. All rights reserved.
+
+A worldwide, royalty-free, non-exclusive right to copy, modify, create
+derivatives, and use, in source and binary forms, is hereby granted, subject to
+acceptance of this license. Performance of any of the aforementioned acts
+indicates acceptance to be bound by the following terms and conditions:
+
+* Copies of source code, in whole or in part, must retain the above copyright
+notice, this list of conditions and the Disclaimer of Warranty.
+
+* Use in binary form must retain the above copyright notice, this list of
+conditions and the Disclaimer of Warranty in the documentation and/or other
+materials provided with the distribution.
+
+* Nothing in this license shall be deemed to grant any rights to trademarks,
+copyrights, patents, trade secrets or any other intellectual property of
+A.M.P.A.S. or any contributors, except as expressly stated herein.
+
+* Neither the name "A.M.P.A.S." nor the name of any other contributors to this
+software may be used to endorse or promote products derivative of or based on
+this software without express prior written permission of A.M.P.A.S. or the
+contributors, as appropriate.
+
+This license shall be construed pursuant to the laws of the State of California,
+and any disputes related thereto shall be subject to the jurisdiction of the
+courts therein.
+
+Disclaimer of Warranty: THIS SOFTWARE IS PROVIDED BY A.M.P.A.S. AND CONTRIBUTORS
+"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+THE IMPLIED WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE, AND
+NON-INFRINGEMENT ARE DISCLAIMED. IN NO EVENT SHALL A.M.P.A.S., OR ANY
+CONTRIBUTORS OR DISTRIBUTORS, BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+SPECIAL, EXEMPLARY, RESITUTIONARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE
+OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF
+ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+WITHOUT LIMITING THE GENERALITY OF THE FOREGOING, THE ACADEMY SPECIFICALLY
+DISCLAIMS ANY REPRESENTATIONS OR WARRANTIES WHATSOEVER RELATED TO PATENT OR
+OTHER INTELLECTUAL PROPERTY RIGHTS IN THE ACES CONTAINER REFERENCE
+IMPLEMENTATION, OR APPLICATIONS THEREOF, HELD BY PARTIES OTHER THAN A.M.P.A.S.,
+WHETHER DISCLOSED OR UNDISCLOSED.
+"""
+
+import json
+import numpy as np
+import threading
+import timeit
+
+#
+# Per-ProcessNode timing and throughput measurements
+#
+# Entries are keyed by node type, name, id and bit depths, so the Range 
+# nodes created to adapt bit depths around bypassed nodes are reported 
+# together across calls.
+#
+# 'bytesProcessed' counts the values read by each ProcessNode.
+# 'bytesAllocated' counts the output buffers each ProcessNode allocated. 
+# Nodes that write into a shared buffer, as they do when processing whole
+# buffers, don't allocate output buffers. Temporary values used inside a 
+# ProcessNode aren't counted.
+#
+# When processing with more than one thread, 'seconds' is the sum of the 
+# time spent by each thread.
+#
+timer = timeit.default_timer
+
+def getProcessNodeKey(processNode):
+    return (processNode.getNodeType(),
+        processNode.getAttribute('name'),
+        processNode.getAttribute('id'),
+        processNode.getInBitDepth(),
+        processNode.getOutBitDepth())
+# getProcessNodeKey
+
+class ProcessProfile(object):
+    "Timing and throughput measurements for the ProcessNodes in a ProcessList or Group"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+    # __init__
+
+    def reset(self):
+        self._entries = []
+        self._entriesByKey = {}
+    # reset
+
+    def record(self, processNode, seconds, pixels, bytesProcessed, bytesAllocated=0):
+        key = getProcessNodeKey(processNode)
+        with self._lock:
+            self.recordEntry(key, processNode, seconds, pixels, bytesProcessed, bytesAllocated)
+    # record
+
+    def recordEntry(self, key, processNode, seconds, pixels, bytesProcessed, bytesAllocated):
+        if key in self._entriesByKey:
+            entry = self._entriesByKey[key]
+        else:
+            entry = {'node' : processNode, 
+                'calls' : 0, 'seconds' : 0.0, 'pixels' : 0, 
+                'bytesProcessed' : 0, 'bytesAllocated' : 0}
+            self._entriesByKey[key] = entry
+            self._entries.append(entry)
+
+        entry['calls'] += 1
+        entry['seconds'] += seconds
+        entry['pixels'] += int(pixels)
+        entry['bytesProcessed'] += int(bytesProcessed)
+        entry['bytesAllocated'] += int(bytesAllocated)
+    # recordEntry
+
+    # Returns a dict with the totals and a 'nodes' list with one dict per 
+    # ProcessNode, in the order they were first run. Groups with profiling
+    # enabled report their own ProcessNodes in a nested 'nodes' list.
+    def getReport(self):
+        nodes = []
+        for entry in self._entries:
+            processNode = entry['node']
+            report = {'type' : processNode.getNodeType(),
+                'name' : processNode.getAttribute('name'),
+                'id' : processNode.getAttribute('id'),
+                'inBitDepth' : processNode.getInBitDepth(),
+                'outBitDepth' : processNode.getOutBitDepth()}
+            for key in ['calls', 'seconds', 'pixels', 'bytesProcessed', 'bytesAllocated']:
+                report[key] = entry[key]
+            report['pixelsPerSecond'] = getRate(entry['pixels'], entry['seconds'])
+
+            if hasattr(processNode, 'getProfile'):
+                childReport = processNode.getProfile()
+                if childReport != None:
+                    report['nodes'] = childReport['nodes']
+
+            nodes.append(report)
+
+        report = {}
+        for key in ['calls', 'seconds', 'bytesProcessed', 'bytesAllocated']:
+            report[key] = sum([entry[key] for entry in nodes])
+        report['nodes'] = nodes
+
+        return report
+    # getReport
+
+    def getJSON(self, indent=2):
+        return json.dumps(self.getReport(), indent=indent, sort_keys=True)
+    # getJSON
+
+    def printInfo(self, report=None, indent=0):
+        if report == None:
+            report = self.getReport()
+            print( "%-40s %8s %12s %14s %14s %14s" % 
+                ("ProcessNode", "calls", "seconds", "pixels/second", "bytes read", "bytes alloc") )
+
+        for node in report['nodes']:
+            label = "%s%s (%s)" % (" "*indent, node['name'], node['type'])
+            print( "%-40s %8d %12.6f %14.1f %14d %14d" % 
+                (label, node['calls'], node['seconds'], node['pixelsPerSecond'],
+                    node['bytesProcessed'], node['bytesAllocated']) )
+            if 'nodes' in node:
+                self.printInfo(node, indent+2)
+    # printInfo
+# ProcessProfile
+
+def getRate(count, seconds):
+    if seconds > 0.0:
+        return count/seconds
+    else:
+        return 0.0
+# getRate
+
+# Runs a ProcessNode's process method and records the call
+def profileProcess(profile, processNode, values, stride=0, verbose=False):
+    start = timer()
+    result = processNode.process(values, stride, verbose=verbose)
+    seconds = timer() - start
+
+    if stride == 0:
+        pixels = 1
+    else:
+        pixels = len(values)/stride
+
+    if result is values:
+        bytesAllocated = 0
+    else:
+        bytesAllocated = np.asarray(result).nbytes
+
+    profile.record(processNode, seconds, pixels, np.asarray(values).nbytes, bytesAllocated)
+    return result
+# profileProcess
@@ -52,6 +52,8 @@ IMPLEMENTATION, OR APPLICATIONS THEREOF, HELD BY PARTIES OTHER THAN A.M.P.A.S.,
 WHETHER DISCLOSED OR UNDISCLOSED.
 """
 
+import numpy as np
+
 from ProcessNode import *
 
 class Range(ProcessNode):
@@ -98,7 +100,10 @@ class Range(ProcessNode):
         return None
     # readChild
 
-    def process(self, value, stride=0, verbose=False):
+    # The scale, offset and clamp bounds that map input values to output
+    # values, including the conversions from the input bit depth and to the
+    # output bit depth. The bounds are None for values that aren't clamped.
+    def getProcessParameters(self):
         # Base attributes
         inBitDepth = self._attributes['inBitDepth']
         outBitDepth = self._attributes['outBitDepth']
@@ -144,40 +149,101 @@ class Range(ProcessNode):
         print( "max out value : %s" % maxOutValue )
         '''
 
-        # Actually process a value or two
-        outValue = value
-        for i in range(len(value)):
-            # Convert to normalized range
-            outValue[i] = bitDepthToNormalized(outValue[i], inBitDepth)
-
-            # All values specified
-            if( minInValue != None and 
-                maxInValue != None and
-                minOutValue != None and
-                maxOutValue != None ):
-                scale=(maxOutValue - minOutValue) / (maxInValue - minInValue)
-                outValue[i] = outValue[i] * scale + minOutValue - minInValue*scale
-                if clamp:
-                    outValue[i] = min( maxOutValue, max( minOutValue, outValue[i] ) )
-
-            # Only minimum values
-            elif( minInValue != None and 
-                minOutValue != None ):
-                outValue[i] = outValue[i] + minOutValue - minInValue
-                if clamp:
-                    outValue[i] = max(minOutValue, outValue[i])
-
-            # Only maximum values
-            elif( maxInValue != None and 
-                maxOutValue != None ):
-                outValue[i] = outValue[i] + maxOutValue - maxInValue
-                if clamp:
-                    outValue[i] = min( maxOutValue, outValue[i])
-
-            # Convert to bit-depth specific range
-            outValue[i] = normalizedToBitDepth(outValue[i], outBitDepth)
-        return outValue
+        scale = 1.0
+        offset = 0.0
+        minValue = None
+        maxValue = None
+
+        # All values specified
+        if( minInValue != None and 
+            maxInValue != None and
+            minOutValue != None and
+            maxOutValue != None ):
+            scale = (maxOutValue - minOutValue) / (maxInValue - minInValue)
+            offset = minOutValue - minInValue*scale
+            if clamp:
+                minValue = minOutValue
+                maxValue = maxOutValue
+
+        # Only minimum values
+        elif( minInValue != None and 
+            minOutValue != None ):
+            offset = minOutValue - minInValue
+            if clamp:
+                minValue = minOutValue
+
+        # Only maximum values
+        elif( maxInValue != None and 
+            maxOutValue != None ):
+            offset = maxOutValue - maxInValue
+            if clamp:
+                maxValue = maxOutValue
+
+        # Include the conversions to and from the normalized range
+        scale *= bitDepthSize(outBitDepth) / bitDepthSize(inBitDepth)
+        offset *= bitDepthSize(outBitDepth)
+        if minValue != None:
+            minValue *= bitDepthSize(outBitDepth)
+        if maxValue != None:
+            maxValue *= bitDepthSize(outBitDepth)
+
+        return (scale, offset, minValue, maxValue)
+    # getProcessParameters
+
+    # Only the first three channels of each pixel are processed. The input 
+    # values are left unchanged.
+    def process(self, values, stride=0, verbose=False):
+        # Handle processing of single values
+        if stride == 0:
+            stride = len(values)
+
+        # Initialize the output value
+        outValues = np.array(values, dtype=np.float32)
+
+        pixels = outValues.reshape(-1, stride)[:, :min(3, stride)]
+        applyRange(pixels, pixels, self.getProcessParameters(), np.float32)
+
+        return outValues
     # process
-# Range
 
+    def prepare(self, precision=precisions["FLOAT32"]):
+        parameters = self.getProcessParameters()
+        computeType = precisionComputeType(precision)
+
+        def kernel(values, out):
+            return applyRange(values, out, parameters, computeType)
+
+        return kernel
+    # prepare
+
+    def getAffine(self):
+        (scale, offset, minValue, maxValue) = self.getProcessParameters()
+
+        # Clamping Ranges aren't affine
+        if minValue != None or maxValue != None:
+            return None
+
+        affine = np.zeros((3, 4), dtype=np.float64)
+        affine[:, :3] = np.identity(3)*scale
+        affine[:, 3] = offset
+        return affine
+    # getAffine
+# Range
 
+#
+# Applies the parameters from Range.getProcessParameters to an array of 
+# values, writing the results to 'out'. NaNs are clamped to the bounds.
+#
+def applyRange(values, out, parameters, computeType=np.float32):
+    (scale, offset, minValue, maxValue) = parameters
+
+    result = np.asarray(values, computeType)*scale
+    result += offset
+    if minValue != None:
+        np.fmax(result, minValue, out=result)
+    if maxValue != None:
+        np.fmin(result, maxValue, out=result)
+
+    out[...] = result
+    return out
+# applyRange
@@ -88,6 +88,29 @@ pl.writeFile("/some/path/test.clf")
 processValue = [0.5, 0, 1.0]
 processedValue = pl.process(processedValue, verbose=True)
 
+# Process an image, stored as a (height, width, channels) numpy array
+processedImage = pl.processArray(image)
+
+# Process an image in place
+pl.processArray(image, out=image)
+
+# Process an image using 4 threads
+pl.processArray(image, out=image, threads=4)
+
+# Process images using doubles for intermediate values
+pl.setPrecision(clf.precisions["FLOAT64"])
+
+# Report the time spent in each ProcessNode
+pl.setProfiling(True)
+pl.processArray(image)
+print( pl.getProfileJSON() )
+
+# Change the exposure of ExposureContrast nodes with an 'EXPOSURE' 
+# DynamicParameter without compiling the ProcessList again
+plan = pl.compile()
+pl.setDynamicParamValue('EXPOSURE', 1.5)
+plan.processArray(image, out=image)
+
 Command Line
 ************
 
@@ -125,7 +148,7 @@ Having the explicit imports here feels off, but also necessary...
 '''
 
 # Feature set compatibility
-from Common import setFeatureCompatibility, getFeatureCompatibility, featureSets
+from Common import setFeatureCompatibility, getFeatureCompatibility, featureSets, precisions
 
 # General Types
 from ProcessList import ProcessList
@@ -74,14 +74,17 @@ testclf.unittests()
 import sys
 import os
 import unittest
+import json
 import math
 import numpy as np
 import tempfile
+import xml.etree.ElementTree as etree
 
 # Make sure we can import aces.clf
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
 
 from aces.clf import *
+from aces.clf.IndexMap import IndexMap
 
 __author__ = 'Haarm-Pieter Duiker'
 __copyright__ = 'Copyright (C) 2015 Academy of Motion Picture Arts and Sciences'
@@ -99,6 +102,8 @@ class TestCLF(unittest.TestCase):
     _tmpdir = ""
     _tmpclf = ""
     _tmpclfz = ""
+    _tmpbakedclf = ""
+    _tmpdeadclf = ""
 
     @classmethod
     def setUpClass(cls):
@@ -108,7 +113,10 @@ class TestCLF(unittest.TestCase):
         cls._tmpdir = tempfile.gettempdir()
         cls._tmpclf = os.path.join(cls._tmpdir, "test.clf")
         cls._tmpclfz = os.path.join(cls._tmpdir, "test.clfz")
-        print( "Unit tests will use : \n\t%s\n\t%s" % (cls._tmpclf, cls._tmpclfz) )
+        cls._tmpbakedclf = os.path.join(cls._tmpdir, "test_baked.clf")
+        cls._tmpdeadclf = os.path.join(cls._tmpdir, "test_dead.clf")
+        print( "Unit tests will use : \n\t%s\n\t%s\n\t%s\n\t%s" % (
+            cls._tmpclf, cls._tmpclfz, cls._tmpbakedclf, cls._tmpdeadclf) )
 
     @classmethod
     def tearDownClass(cls):
@@ -119,6 +127,10 @@ class TestCLF(unittest.TestCase):
         os.unlink(cls._tmpclf)
         print( "Cleaning up : %s" % cls._tmpclfz )
         os.unlink(cls._tmpclfz)
+        print( "Cleaning up : %s" % cls._tmpbakedclf )
+        os.unlink(cls._tmpbakedclf)
+        print( "Cleaning up : %s" % cls._tmpdeadclf )
+        os.unlink(cls._tmpdeadclf)
 
     def createCLF(self, clfPath):
         # If you want to restrict feature compatibility for some reason,
@@ -661,6 +673,73 @@ class TestCLF(unittest.TestCase):
         return processedValue
     # processExample
 
+    def createProcessingCLF(self):
+        pl = ProcessList()
+        pl.setName('Processing comparison transform')
+
+        # Add a range node
+        rpn1 = Range(bitDepths["FLOAT16"], bitDepths["FLOAT16"], "rangeId", "Range1", style='noClamp')
+        rpn1.setMinInValue(0.0)
+        rpn1.setMaxInValue(1.0)
+        rpn1.setMinOutValue(0.05)
+        rpn1.setMaxOutValue(0.95)
+        pl.addProcess(rpn1)
+
+        # Add a 3x4 matrix node
+        mpn1 = Matrix(bitDepths["FLOAT16"], bitDepths["FLOAT16"], "matrixId", "Matrix1")
+        mpn1.setMatrix([3, 4, 3], [0.9, 0.1, 0.0, 0.01, 0.05, 0.8, 0.15, 0.0, 0.0, 0.2, 0.8, -0.01])
+        pl.addProcess(mpn1)
+
+        # Add a ASC CDL Node
+        cdl1 = ASCCDL(bitDepths["FLOAT16"], bitDepths["FLOAT16"], "cdlId", "CDL1", "Fwd")
+        cdl1.setSlope(1.0, 1.1, 0.9)
+        cdl1.setPower(0.9, 0.8, 0.7)
+        cdl1.setOffset(0.01, 0.01, 0.02)
+        cdl1.setSaturation(0.95)
+        pl.addProcess(cdl1)
+
+        # Add a ExposureContrast Node
+        ecp1 = ExposureContrast(bitDepths["FLOAT16"], bitDepths["FLOAT16"], "ecpId", "ExposureContrast1", "video")
+        ecp1.setExposureContrastPivot(0.5, 1.1, 0.18)
+        pl.addProcess(ecp1)
+
+        # Add a Gamma Node
+        gamma1 = Gamma(bitDepths["FLOAT16"], bitDepths["FLOAT16"], "gammaId", "Gamma1", "moncurveFwd")
+        gamma1.setGamma(2.4, 0.055)
+        pl.addProcess(gamma1)
+
+        # Add a Log Node
+        log1 = Log(bitDepths["FLOAT16"], bitDepths["FLOAT16"], "logId", "Log1", "linToLog")
+        log1.setLogParams(0.6, 685.0, 95.0, 1.0, 0.0)
+        pl.addProcess(log1)
+
+        # Add a 1D lut node
+        l1d1 = simpleSampledLUT("l1dId", "LUT1D1", 3, 17, lambda x: x ** 1.5)
+        pl.addProcess(l1d1)
+
+        # Add a 3D lut node, using tetrahedral interpolation
+        l3d1 = simple3DLUT("l3dId", "LUT3D1", [5, 5, 5], lambda x, y, z: [y, z*z, x**0.5])
+        l3d1.setAttribute('interpolation', 'tetrahedral')
+        pl.addProcess(l3d1)
+
+        # Add a 3D lut node, using trilinear interpolation
+        l3d2 = simple3DLUT("l3dId", "LUT3D2", [3, 3, 3], lambda x, y, z: [0.8*x + 0.2*y, y, z*z])
+        pl.addProcess(l3d2)
+
+        return pl
+    # createProcessingCLF
+
+    def processPixels(self, processList, pixels):
+        # Process one pixel at a time, as a reference for whole-buffer processing
+        channels = pixels.shape[-1]
+        flatPixels = pixels.reshape(-1, channels)
+        processedPixels = np.zeros(flatPixels.shape, dtype=np.float32)
+        for i in range(len(flatPixels)):
+            processedPixels[i] = processList.process(np.array(flatPixels[i]), channels)
+
+        return processedPixels.reshape(pixels.shape)
+    # processPixels
+
     #
     # Tests
     #
@@ -728,6 +807,923 @@ class TestCLF(unittest.TestCase):
         self.assertTrue(pl != None)
     #test5ReadGzip
 
+    def test6ProcessArray(self):
+        """
+        Performs tests on whole-buffer *CLF* processing.
+        """
+        pl = self.createProcessingCLF()
+
+        np.random.seed(6)
+
+        # Images
+        image = np.random.uniform(0.0, 1.0, (4, 5, 3)).astype(np.float32)
+        processedImage = pl.processArray(image)
+
+        self.assertEqual(processedImage.shape, image.shape)
+        np.testing.assert_allclose(processedImage, self.processPixels(pl, image), rtol=1e-5, atol=1e-6)
+
+        # Lists of pixels with extra channels. Only the color channels are processed.
+        pixels = np.random.uniform(0.0, 1.0, (16, 4)).astype(np.float32)
+        processedPixels = pl.process(pixels)
+
+        self.assertEqual(processedPixels.shape, pixels.shape)
+        np.testing.assert_allclose(processedPixels[:, :3], self.processPixels(pl, pixels[:, :3]), rtol=1e-5, atol=1e-6)
+        np.testing.assert_array_equal(processedPixels[:, 3], pixels[:, 3])
+    #test6ProcessArray
+
+    def test7Compile(self):
+        """
+        Performs tests on compiled *CLF* processing.
+        """
+        pl = self.createProcessingCLF()
+
+        # Bypass a node between mismatched bit depths
+        pl[0].setOutBitDepth(bitDepths["UINT10"])
+        pl[1].setAttribute("bypass", True)
+
+        plan = pl.compile()
+
+        # The bypassed node is replaced by a bit-depth adapter
+        self.assertEqual(len(plan), len(pl))
+        self.assertTrue(pl[1] not in plan.getProcesses())
+        self.assertEqual(plan.getProcesses()[1].getAttribute('name'), "adapter")
+        self.assertRaises(AttributeError, setattr, plan, '_steps', ())
+
+        np.random.seed(7)
+        pixels = np.random.uniform(0.0, 1.0, (8, 3)).astype(np.float32)
+
+        np.testing.assert_allclose(plan.processArray(pixels), pl.processArray(pixels), rtol=1e-6)
+        np.testing.assert_allclose(plan.process(pixels[0]), pl.process(pixels[0]), rtol=1e-6)
+    #test7Compile
+
+    def test8Optimize(self):
+        """
+        Performs tests on optimizing *CLF* files.
+        """
+        pl = ProcessList()
+        pl.setName('Optimization test transform')
+
+        # Convert from 10 bit values
+        rpn1 = Range(bitDepths["UINT10"], bitDepths["FLOAT16"], "rangeId", "Range1", style='noClamp')
+        pl.addProcess(rpn1)
+
+        # Add an identity matrix
+        mpn1 = Matrix(bitDepths["FLOAT16"], bitDepths["FLOAT16"], "matrixId", "Matrix1")
+        mpn1.setMatrix([3, 3, 3], [1.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0])
+        pl.addProcess(mpn1)
+
+        # Add the nodes from the processing comparison transform
+        for processNode in self.createProcessingCLF():
+            pl.addProcess(processNode)
+
+        # Add a group of identity nodes
+        gpn1 = Group(bitDepths["FLOAT16"], bitDepths["FLOAT16"], "groupId", "Group1")
+        mpn2 = Matrix(bitDepths["FLOAT16"], bitDepths["FLOAT16"], "matrixId", "Matrix2")
+        mpn2.setMatrix([3, 4, 3], [1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0])
+        gpn1.addProcess(mpn2)
+        rpn2 = Range(bitDepths["FLOAT16"], bitDepths["FLOAT16"], "rangeId", "Range2", style='noClamp')
+        gpn1.addProcess(rpn2)
+        pl.addProcess(gpn1)
+
+        np.random.seed(8)
+        pixels = np.random.uniform(0.0, 1023.0, (16, 3)).astype(np.float32)
+        expected = pl.processArray(pixels)
+
+        # The first four nodes are combined and the Group is emptied
+        processCount = len(pl)
+        self.assertEqual(pl.optimize(), 5)
+        self.assertEqual(len(pl), processCount - 3)
+        self.assertEqual(pl[0].getNodeType(), 'Matrix')
+        self.assertEqual(pl.getInBitDepth(), bitDepths["UINT10"])
+        self.assertEqual(len(gpn1.getProcesses()), 0)
+
+        np.testing.assert_allclose(pl.processArray(pixels), expected, rtol=1e-5, atol=1e-6)
+
+        # Optimizing again doesn't change anything
+        self.assertEqual(pl.optimize(), 0)
+    #test8Optimize
+
+    def test9Bake(self):
+        """
+        Performs tests on baking *CLF* files into LUTs.
+        """
+        pl = self.createProcessingCLF()
+
+        # The resolution should be increased to meet the tolerance
+        (baked, maxError, meanError) = pl.bake(tolerance=1e-2, 
+            shaperIn=['log2', -6.0, 0.0], shaperOut=['linear', 0.0, 1.0],
+            lutResolution1d3d1d=[256, 5, 256])
+
+        self.assertTrue(maxError <= 1e-2)
+        self.assertTrue(meanError <= maxError)
+        self.assertEqual([processNode.getNodeType() for processNode in baked],
+            ['Range', 'LUT1D', 'LUT3D', 'LUT1D'])
+        self.assertTrue(baked[2].getLUTDimensions()[0] > 5)
+
+        # The baked ProcessList can be written and read back
+        baked.writeFile(self._tmpbakedclf)
+        bakedRead = ProcessList(self._tmpbakedclf)
+
+        np.random.seed(9)
+        pixels = np.random.uniform(0.0, 1.0, (16, 3)).astype(np.float32)
+
+        np.testing.assert_allclose(bakedRead.processArray(pixels), baked.processArray(pixels), rtol=1e-5, atol=1e-6)
+        np.testing.assert_allclose(baked.processArray(pixels), pl.processArray(pixels), atol=1e-2)
+    #test9Bake
+
+    def test10ProcessOut(self):
+        """
+        Performs tests on processing into preallocated buffers.
+        """
+        pl = self.createProcessingCLF()
+
+        np.random.seed(10)
+        image = np.random.uniform(0.0, 1.0, (4, 5, 3)).astype(np.float32)
+        imageCopy = np.array(image)
+        expected = pl.processArray(image)
+
+        # Separate output buffer. The input isn't modified.
+        out = np.zeros(image.shape, np.float32)
+        result = pl.processArray(image, out=out)
+        self.assertTrue(result is out)
+        np.testing.assert_array_equal(image, imageCopy)
+        np.testing.assert_array_equal(out, expected)
+
+        # In place
+        result = pl.processArray(image, out=image)
+        self.assertTrue(result is image)
+        np.testing.assert_array_equal(image, expected)
+
+        # Flat buffers
+        flatOut = np.zeros(imageCopy.size, np.float32)
+        result = pl.process(imageCopy.ravel(), 3, out=flatOut)
+        self.assertTrue(result is flatOut)
+        np.testing.assert_array_equal(flatOut, expected.ravel())
+    #test10ProcessOut
+
+    def test11Precision(self):
+        """
+        Performs tests on processing at different precisions.
+        """
+        pl = self.createProcessingCLF()
+
+        np.random.seed(11)
+        pixels = np.random.uniform(0.0, 1.0, (16, 3))
+        expected = pl.processArray(pixels)
+
+        self.assertEqual(pl.getPrecision(), precisions["FLOAT32"])
+        self.assertEqual(expected.dtype, np.float32)
+
+        pl.setPrecision(precisions["FLOAT64"])
+        result = pl.processArray(pixels)
+        self.assertEqual(result.dtype, np.float64)
+        np.testing.assert_allclose(result, expected, rtol=1e-5, atol=1e-6)
+
+        # Each node adds a relative error of up to 2^-11 to half-float values
+        pl.setPrecision(precisions["FLOAT16"])
+        result = pl.processArray(pixels)
+        self.assertEqual(result.dtype, np.float16)
+        np.testing.assert_allclose(result, expected, rtol=len(pl)*2**-11, atol=1e-3)
+
+        self.assertRaises(Errors.UnsupportedPrecisionError, pl.setPrecision, "float128")
+    #test11Precision
+
+    def test12Layouts(self):
+        """
+        Performs tests on processing RGBA and planar buffers.
+        """
+        pl = self.createProcessingCLF()
+
+        np.random.seed(12)
+        image = np.random.uniform(0.0, 1.0, (4, 5, 4)).astype(np.float32)
+        expected = pl.processArray(image[:, :, :3])
+
+        # Interleaved RGBA, processed in place. Alpha is left untouched.
+        result = np.array(image)
+        pl.processArray(result, out=result)
+        np.testing.assert_array_equal(result[:, :, :3], expected)
+        np.testing.assert_array_equal(result[:, :, 3], image[:, :, 3])
+
+        # Planar RGBA
+        planarImage = np.ascontiguousarray(np.transpose(image, (2, 0, 1)))
+        result = pl.processArray(planarImage, layout='planar')
+        self.assertEqual(result.shape, planarImage.shape)
+        np.testing.assert_array_equal(np.transpose(result[:3], (1, 2, 0)), expected)
+        np.testing.assert_array_equal(result[3], planarImage[3])
+
+        # 4x4 matrices process the alpha channel
+        mpn1 = Matrix(bitDepths["FLOAT16"], bitDepths["FLOAT16"], "matrixId", "Matrix1")
+        mpn1.setMatrix([4, 4, 4], [1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.5, 0.0, 0.0, 0.5])
+        pl.addProcess(mpn1)
+        result = pl.processArray(planarImage, layout='planar')
+        np.testing.assert_allclose(result[3], 0.5*(np.transpose(expected, (2, 0, 1))[0] + planarImage[3]), rtol=1e-6)
+
+        self.assertRaises(Errors.UnsupportedLayoutError, pl.processArray, image, layout='tiled')
+    #test12Layouts
+
+    def test13RemoveDeadNodes(self):
+        """
+        Performs tests on removing bypassed and identity nodes when reading *CLF* files.
+        """
+        pl = ProcessList()
+        pl.setID('Dead node test transform')
+        pl.setName('Dead node test transform')
+
+        # Add an identity matrix
+        mpn1 = Matrix(bitDepths["FLOAT16"], bitDepths["FLOAT16"], "matrixId", "Matrix1")
+        mpn1.setMatrix([3, 3, 3], [1.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0])
+        pl.addProcess(mpn1)
+
+        # Add the nodes from the processing comparison transform
+        for processNode in self.createProcessingCLF():
+            pl.addProcess(processNode)
+
+        # Add an identity ASC CDL node
+        cdl1 = ASCCDL(bitDepths["FLOAT16"], bitDepths["FLOAT16"], "cdlId", "CDL2", "FwdNoClamp")
+        cdl1.setSlope(1.0, 1.0, 1.0)
+        cdl1.setOffset(0.0, 0.0, 0.0)
+        cdl1.setPower(1.0, 1.0, 1.0)
+        cdl1.setSaturation(1.0)
+        pl.addProcess(cdl1)
+
+        # Add an identity Range node
+        rpn1 = Range(bitDepths["FLOAT16"], bitDepths["FLOAT16"], "rangeId", "Range2", style='noClamp')
+        rpn1.setMinInValue(0.0)
+        rpn1.setMaxInValue(1.0)
+        rpn1.setMinOutValue(0.0)
+        rpn1.setMaxOutValue(1.0)
+        pl.addProcess(rpn1)
+
+        # Bypass a node between mismatched bit depths
+        pl[1].setOutBitDepth(bitDepths["UINT10"])
+        pl[2].setAttribute("bypass", True)
+
+        pl.writeFile(self._tmpdeadclf)
+
+        original = ProcessList(self._tmpdeadclf)
+        reduced = ProcessList(self._tmpdeadclf, removeDeadNodes=True)
+
+        # The identity Matrix, CDL and Range nodes and the bypassed Matrix are
+        # removed. The bypassed node is replaced by a bit-depth adapter.
+        self.assertEqual(len(reduced), len(original) - 3)
+        self.assertEqual(reduced[0].getAttribute('name'), 'Range1')
+        self.assertEqual(reduced[1].getAttribute('name'), 'adapter')
+        self.assertEqual(reduced.getInBitDepth(), original.getInBitDepth())
+        self.assertEqual(reduced.getOutBitDepth(), original.getOutBitDepth())
+
+        np.random.seed(13)
+        pixels = np.random.uniform(0.0, 1.0, (16, 3)).astype(np.float32)
+
+        np.testing.assert_allclose(reduced.processArray(pixels), original.processArray(pixels), rtol=1e-6)
+
+        # Nothing else to remove
+        self.assertEqual(reduced.removeDeadNodes(), 0)
+    #test13RemoveDeadNodes
+
+    def test14Profile(self):
+        """
+        Performs tests on profiling *CLF* processing.
+        """
+        pl = self.createProcessingCLF()
+
+        # Profiling is off by default
+        self.assertEqual(pl.getProfile(), None)
+
+        group = Group(bitDepths["FLOAT16"], bitDepths["FLOAT16"], "groupId", "Group1")
+        mpn1 = Matrix(bitDepths["FLOAT16"], bitDepths["FLOAT16"], "matrixId", "GroupMatrix")
+        mpn1.setMatrix([3, 3, 3], [0.5, 0.0, 0.0, 0.0, 0.5, 0.0, 0.0, 0.0, 0.5])
+        group.addProcess(mpn1)
+        pl.addProcess(group)
+
+        pl.setProfiling(True)
+        self.assertTrue(group.getProfiling())
+
+        np.random.seed(14)
+        pixels = np.random.uniform(0.0, 1.0, (16, 3)).astype(np.float32)
+        pl.processArray(pixels)
+        pl.processArray(pixels)
+        pl.process([0.5, 0.25, 0.125])
+
+        report = pl.getProfile()
+        self.assertEqual(len(report['nodes']), len(pl))
+        for (processNode, node) in zip(pl, report['nodes']):
+            self.assertEqual(node['name'], processNode.getAttribute('name'))
+            self.assertEqual(node['calls'], 3)
+            self.assertEqual(node['pixels'], 16*2 + 1)
+            self.assertTrue(node['seconds'] >= 0.0)
+
+            # Whole-buffer processing doesn't allocate buffers between nodes
+            self.assertTrue(node['bytesAllocated'] <= 3*4)
+
+        self.assertEqual(report['nodes'][0]['bytesProcessed'], 16*2*3*4 + 3*4)
+
+        # Group nodes are reported in their own list
+        self.assertEqual(len(report['nodes'][-1]['nodes']), 1)
+        self.assertEqual(report['nodes'][-1]['nodes'][0]['name'], 'GroupMatrix')
+        self.assertEqual(report['nodes'][-1]['nodes'][0]['calls'], 3)
+
+        self.assertEqual(json.loads(pl.getProfileJSON()), report)
+
+        pl.resetProfile()
+        self.assertEqual(pl.getProfile()['nodes'], [])
+        self.assertEqual(group.getProfile()['nodes'], [])
+
+        pl.setProfiling(False)
+        self.assertEqual(pl.getProfile(), None)
+    #test14Profile
+
+    def test15Threads(self):
+        """
+        Performs tests on processing *CLF* transforms using more than one thread.
+        """
+        pl = self.createProcessingCLF()
+
+        np.random.seed(15)
+        pixels = np.random.uniform(0.0, 1.0, (1000, 4)).astype(np.float32)
+        reference = pl.processArray(pixels)
+
+        # Use small chunks so that the pixels are split between the threads
+        processListModule = sys.modules[ProcessList.__module__]
+        processChunkBytes = processListModule.processChunkBytes
+        processListModule.processChunkBytes = 64*4*4
+        try:
+            # Chunks are processed independently so the results are the same
+            np.testing.assert_array_equal(pl.processArray(pixels, threads=4), reference)
+
+            # In place
+            image = pixels.reshape(25, 40, 4).copy()
+            pl.processArray(image, out=image, threads=4)
+            np.testing.assert_array_equal(image.reshape(-1, 4), reference)
+
+            # Planar
+            planar = np.ascontiguousarray(pixels.T)
+            np.testing.assert_array_equal(pl.processArray(planar, layout='planar', threads=4).T, reference)
+
+            # Flat buffers
+            flat = pl.process(list(pixels.ravel()), stride=4, threads=4)
+            np.testing.assert_array_equal(flat, reference.ravel())
+        finally:
+            processListModule.processChunkBytes = processChunkBytes
+    #test15Threads
+
+    def test16LUT1DLinear(self):
+        """
+        Performs tests on whole-buffer processing of linearly interpolated 1D LUTs.
+        """
+        np.random.seed(16)
+        pixels = np.random.uniform(-0.25, 1.25, (64, 3)).astype(np.float32)
+        pixels[0] = [float('nan'), float('inf'), -float('inf')]
+        pixels[1] = [0.0, 1.0, 0.5]
+
+        # One and three channel LUTs
+        l1d1 = simpleSampledLUT("l1dId", "LUT1D1", 1, 11, lambda x: x ** 2.2)
+        l1d3 = simpleSampledLUT("l1dId", "LUT1D3", 3, 33, lambda x: 1.0 - x*x)
+
+        # Integer input bit depth
+        l1d10 = simpleSampledLUT("l1dId", "LUT1D10", 3, 17, lambda x: x ** 0.5,
+            inBitDepth=bitDepths["UINT10"])
+
+        for (lut, inputPixels) in [(l1d1, pixels), (l1d3, pixels), (l1d10, pixels*1023.0)]:
+            pl = ProcessList()
+            pl.addProcess(lut)
+
+            reference = self.processPixels(pl, inputPixels)
+            for precision in [precisions["FLOAT32"], precisions["FLOAT64"]]:
+                pl.setPrecision(precision)
+                np.testing.assert_allclose(pl.processArray(inputPixels), reference, rtol=1e-5, atol=1e-6)
+
+            # Channels beyond the first three are left untouched
+            rgba = np.concatenate([inputPixels, np.ones((64, 1), np.float32)], axis=1)
+            pl.setPrecision(precisions["FLOAT32"])
+            processed = pl.processArray(rgba)
+            np.testing.assert_allclose(processed[:, :3], reference, rtol=1e-5, atol=1e-6)
+            np.testing.assert_array_equal(processed[:, 3], rgba[:, 3])
+    #test16LUT1DLinear
+
+    def test17LUT1DHalfDomain(self):
+        """
+        Performs tests on whole-buffer processing of half-domain 1D LUTs.
+        """
+        np.random.seed(17)
+        pixels = np.concatenate([
+            np.random.uniform(-2.0, 2.0, (48, 3)),
+            np.random.uniform(-1e-5, 1e-5, (16, 3)),
+            np.random.uniform(-70000.0, 70000.0, (16, 3))]).astype(np.float32)
+        pixels[0] = [float('nan'), float('inf'), -float('inf')]
+        pixels[1] = [0.0, -0.0, 65504.0]
+        pixels[2] = [-65504.0, 65519.0, 65520.0]
+        pixels[3] = [1.0, -1.0, 2.0**-24]
+
+        # LUT values stored as half and double floats
+        l1dh1 = simpleSampledLUTHalfDomain("l1dId", "LUT1DH1", 1, lambda x: x)
+        l1dh3 = simpleSampledLUTHalfDomain("l1dId", "LUT1DH3", 3, 
+            lambda x: 0.5*float(x) + 0.1 if np.isfinite(x) else 0.0)
+
+        for lut in [l1dh1, l1dh3]:
+            pl = ProcessList()
+            pl.addProcess(lut)
+
+            # Same results as the per-pixel implementation
+            np.testing.assert_array_equal(pl.processArray(pixels), self.processPixels(pl, pixels))
+    #test17LUT1DHalfDomain
+
+    def test18LUT1DCubic(self):
+        """
+        Performs tests on cubic interpolation of 1D LUTs.
+        """
+        f = lambda x: math.sin(x*2.0)
+        l1dc = simpleSampledLUT("l1dId", "LUT1DC", 3, 17, f)
+        l1dc.setAttribute('interpolation', 'cubic')
+        l1dl = simpleSampledLUT("l1dId", "LUT1DL", 3, 17, f)
+
+        np.random.seed(18)
+        pixels = np.random.uniform(-0.25, 1.25, (64, 3)).astype(np.float32)
+        pixels[0] = [float('nan'), float('inf'), -float('inf')]
+        pixels[1] = [0.0, 0.5, 1.0]
+
+        pl = ProcessList()
+        pl.addProcess(l1dc)
+
+        reference = self.processPixels(pl, pixels)
+        for precision in [precisions["FLOAT32"], precisions["FLOAT64"]]:
+            pl.setPrecision(precision)
+            np.testing.assert_allclose(pl.processArray(pixels), reference, rtol=1e-5, atol=1e-6)
+
+        # The LUT entries and the ends of the LUT are reproduced
+        np.testing.assert_allclose(reference[1], [f(0.0), f(0.5), f(1.0)], atol=1e-6)
+        np.testing.assert_allclose(reference[0, 1:], [f(1.0), f(0.0)], atol=1e-6)
+        self.assertTrue(np.isnan(reference[0, 0]))
+
+        # Cubic interpolation of a smooth function is closer than linear interpolation
+        samples = np.linspace(0.0, 1.0, 301).astype(np.float32)
+        pixels = np.repeat(samples.reshape(-1, 1), 3, axis=1)
+        expected = np.sin(pixels.astype(np.float64)*2.0)
+
+        plLinear = ProcessList()
+        plLinear.addProcess(l1dl)
+        cubicError = np.abs(pl.processArray(pixels) - expected).max()
+        linearError = np.abs(plLinear.processArray(pixels) - expected).max()
+        self.assertTrue(cubicError < linearError/4.0)
+
+        # LUTs with fewer than 4 entries use linear interpolation
+        l1dc3 = simpleSampledLUT("l1dId", "LUT1DC3", 3, 3, f)
+        l1dc3.setAttribute('interpolation', 'cubic')
+        l1dl3 = simpleSampledLUT("l1dId", "LUT1DL3", 3, 3, f)
+        pl3c = ProcessList()
+        pl3c.addProcess(l1dc3)
+        pl3l = ProcessList()
+        pl3l.addProcess(l1dl3)
+        np.testing.assert_array_equal(pl3c.processArray(pixels), pl3l.processArray(pixels))
+        np.testing.assert_array_equal(pl3c.process(list(pixels[5])), pl3l.process(list(pixels[5])))
+    #test18LUT1DCubic
+
+    def test19LUT3DTrilinear(self):
+        """
+        Performs tests on whole-buffer processing of trilinear 3D LUTs.
+        """
+        f = lambda x, y, z: [x*x + 0.1*y, math.sin(y*2.0)*z, (x + y + z)/3.0]
+        l3d = simple3DLUT("l3dId", "LUT3D1", [17, 17, 17], f)
+        l3d10 = simple3DLUT("l3dId", "LUT3D10", [9, 9, 9], f, inBitDepth=bitDepths["UINT10"])
+
+        np.random.seed(19)
+        pixels = np.random.uniform(-0.25, 1.25, (64, 3)).astype(np.float32)
+        pixels[0] = [float('nan'), float('inf'), -float('inf')]
+        pixels[1] = [0.0, 0.5, 1.0]
+
+        for (lut, inputPixels) in [(l3d, pixels), (l3d10, pixels*1023.0)]:
+            pl = ProcessList()
+            pl.addProcess(lut)
+
+            reference = self.processPixels(pl, inputPixels)
+            for precision in [precisions["FLOAT32"], precisions["FLOAT64"]]:
+                pl.setPrecision(precision)
+                np.testing.assert_allclose(pl.processArray(inputPixels), reference, rtol=1e-5, atol=1e-6)
+
+        pl = ProcessList()
+        pl.addProcess(l3d)
+        reference = self.processPixels(pl, pixels)
+
+        # The LUT entries are reproduced
+        np.testing.assert_allclose(reference[1], f(0.0, 0.5, 1.0), rtol=1e-6)
+
+        # Channels beyond the first three are left untouched
+        rgba = np.concatenate([pixels, np.ones((64, 1), np.float32)], axis=1)
+        processed = pl.processArray(rgba)
+        np.testing.assert_allclose(processed[:, :3], reference, rtol=1e-5, atol=1e-6)
+        np.testing.assert_array_equal(processed[:, 3], rgba[:, 3])
+    #test19LUT3DTrilinear
+
+    def test20LUT3DTetrahedral(self):
+        """
+        Performs tests on whole-buffer processing of tetrahedral 3D LUTs.
+        """
+        f = lambda x, y, z: [x*x + 0.1*y, math.sin(y*2.0)*z, (x + y + z)/3.0]
+        l3d = simple3DLUT("l3dId", "LUT3D1", [17, 17, 17], f)
+        l3d.setAttribute('interpolation', 'tetrahedral')
+
+        np.random.seed(20)
+        pixels = np.random.uniform(-0.25, 1.25, (256, 3)).astype(np.float32)
+        pixels[0] = [float('nan'), float('inf'), -float('inf')]
+        pixels[1] = [0.0, 0.5, 1.0]
+
+        # Positions on the faces and diagonals of the cubes, where the
+        # tetrahedra meet
+        grid = np.array([0.0, 0.5, 1.0, 2.0])/16.0 + 3.0/16.0
+        pixels[2:66] = np.array([[r, g, b] for r in grid for g in grid for b in grid])
+
+        pl = ProcessList()
+        pl.addProcess(l3d)
+
+        reference = self.processPixels(pl, pixels)
+        for precision in [precisions["FLOAT32"], precisions["FLOAT64"]]:
+            pl.setPrecision(precision)
+            np.testing.assert_allclose(pl.processArray(pixels), reference, rtol=1e-5, atol=1e-6)
+
+        # The LUT entries are reproduced
+        np.testing.assert_allclose(reference[1], f(0.0, 0.5, 1.0), rtol=1e-6)
+    #test20LUT3DTetrahedral
+
+    def test21Matrix(self):
+        """
+        Performs tests on whole-buffer processing of Matrix nodes.
+        """
+        np.random.seed(21)
+        pixels = np.random.uniform(-0.25, 1.25, (64, 5)).astype(np.float32)
+
+        for dimensions in [[3, 3, 3], [3, 4, 3], [4, 4, 4], [4, 5, 4]]:
+            mpn = Matrix(bitDepths["FLOAT16"], bitDepths["FLOAT16"], "matrixId", "Matrix1")
+            mpn.setMatrix(dimensions, list(np.random.uniform(-1.0, 1.0, dimensions[0]*dimensions[1])))
+
+            pl = ProcessList()
+            pl.addProcess(mpn)
+
+            reference = self.processPixels(pl, pixels)
+            for precision in [precisions["FLOAT32"], precisions["FLOAT64"]]:
+                pl.setPrecision(precision)
+                processed = pl.processArray(pixels)
+                np.testing.assert_allclose(processed, reference, rtol=1e-5, atol=1e-6)
+
+                # Channels beyond those of the matrix are left untouched
+                np.testing.assert_array_equal(processed[:, dimensions[0]:], pixels[:, dimensions[0]:])
+    #test21Matrix
+
+    def test22Range(self):
+        """
+        Performs tests on processing with Range nodes.
+        """
+        def createRange(inBitDepth, outBitDepth, style, minIn, maxIn, minOut, maxOut):
+            rpn = Range(inBitDepth, outBitDepth, "rangeId", "Range1", style=style)
+            if minIn != None: rpn.setMinInValue(minIn)
+            if maxIn != None: rpn.setMaxInValue(maxIn)
+            if minOut != None: rpn.setMinOutValue(minOut)
+            if maxOut != None: rpn.setMaxOutValue(maxOut)
+            return rpn
+
+        f16 = bitDepths["FLOAT16"]
+        i10 = bitDepths["UINT10"]
+        nan = float('nan')
+
+        # Input pixel with alpha, expected RGB output
+        tests = [
+            (createRange(f16, f16, 'clamp', 0.25, 0.75, 0.0, 1.0),
+                [0.5, 0.0, nan, 2.0], [0.5, 0.0, 0.0]),
+            (createRange(f16, f16, 'noClamp', 0.25, 0.75, 0.0, 1.0),
+                [0.5, 0.0, 1.0, 2.0], [0.5, -0.5, 1.5]),
+            (createRange(f16, f16, 'clamp', 0.1, None, 0.2, None),
+                [0.5, 0.0, nan, 2.0], [0.6, 0.2, 0.2]),
+            (createRange(f16, f16, 'clamp', None, 0.9, None, 0.8),
+                [0.5, 1.0, nan, 2.0], [0.4, 0.8, 0.8]),
+            (createRange(i10, f16, 'clamp', 64.0, 940.0, 0.0, 1.0),
+                [502.0, 0.0, 1023.0, 1023.0], [0.5, 0.0, 1.0]),
+            (createRange(f16, i10, 'noClamp', None, None, None, None),
+                [0.5, 0.0, 1.0, 1.0], [511.5, 0.0, 1023.0])]
+
+        for (rpn, value, expected) in tests:
+            inputValue = np.array(value, dtype=np.float32)
+            processed = rpn.process(inputValue, stride=4)
+
+            np.testing.assert_allclose(processed[:3], expected, rtol=1e-6, atol=1e-6)
+
+            # Alpha is left alone and the input isn't modified
+            self.assertEqual(processed[3], value[3])
+            np.testing.assert_array_equal(inputValue, np.array(value, dtype=np.float32))
+
+            # Whole-buffer processing gives the same results
+            pl = ProcessList()
+            pl.addProcess(rpn)
+            np.testing.assert_allclose(pl.processArray(inputValue.reshape(1, 4))[0], processed, rtol=1e-6)
+    #test22Range
+
+    def test23ASCCDL(self):
+        """
+        Performs tests on whole-buffer processing of ASC CDL nodes.
+        """
+        np.random.seed(23)
+        pixels = np.random.uniform(-0.25, 1.25, (64, 4)).astype(np.float32)
+        pixels[0, 0] = float('nan')
+
+        styles = ['Fwd', 'FwdNoClamp', 'Rev', 'RevNoClamp', 
+            'v1.2_Fwd', 'noClampFwd', 'v1.2_Rev', 'noClampRev']
+        sizes = {bitDepths["FLOAT16"] : 1.0, bitDepths["FLOAT32"] : 1.0,
+            bitDepths["UINT10"] : 1023.0, bitDepths["UINT12"] : 4095.0}
+        bitDepthPairs = [(bitDepths["FLOAT16"], bitDepths["FLOAT16"]), 
+            (bitDepths["UINT10"], bitDepths["FLOAT32"]),
+            (bitDepths["FLOAT32"], bitDepths["UINT12"])]
+
+        for style in styles:
+            for (inBitDepth, outBitDepth) in bitDepthPairs:
+                cdl = ASCCDL(inBitDepth, outBitDepth, "cdlId", "CDL1", style)
+                cdl.setSlope(1.1, 0.9, 1.2)
+                cdl.setOffset(-0.05, 0.02, 0.1)
+                cdl.setPower(1.4, 0.8, 1.0)
+                cdl.setSaturation(1.3)
+
+                pl = ProcessList()
+                pl.addProcess(cdl)
+
+                inputPixels = pixels * sizes[inBitDepth]
+                reference = self.processPixels(pl, inputPixels)
+                processed = pl.processArray(inputPixels)
+
+                np.testing.assert_allclose(processed, reference, 
+                    rtol=1e-5, atol=1e-5*sizes[outBitDepth], err_msg=style)
+
+                # Alpha is left untouched
+                np.testing.assert_array_equal(processed[:, 3], inputPixels[:, 3])
+
+        # ColorCorrection nodes have no style and leave values unchanged
+        cc = ColorCorrection()
+        cc.setSlope(1.1, 0.9, 1.2)
+        out = np.zeros((64, 3), dtype=np.float32)
+        cc.prepare()(pixels[:, :3], out)
+        np.testing.assert_array_equal(out, pixels[:, :3])
+    #test23ASCCDL
+
+    def test24Gamma(self):
+        """
+        Performs tests on whole-buffer processing of Gamma nodes.
+        """
+        np.random.seed(24)
+        pixels = np.random.uniform(-0.25, 1.25, (64, 4)).astype(np.float32)
+        pixels[0, 0] = float('nan')
+
+        for style in ['basicFwd', 'basicRev', 'moncurveFwd', 'moncurveRev']:
+            for (inBitDepth, outBitDepth, scale) in [
+                (bitDepths["FLOAT16"], bitDepths["FLOAT16"], 1.0),
+                (bitDepths["UINT10"], bitDepths["FLOAT32"], 1023.0)]:
+                gamma = Gamma(inBitDepth, outBitDepth, "gammaId", "Gamma1", style)
+                gamma.setGamma(2.4, 0.055)
+                gamma.setGamma(2.2, 0.099, "G")
+
+                pl = ProcessList()
+                pl.addProcess(gamma)
+
+                reference = self.processPixels(pl, pixels*scale)
+                processed = pl.processArray(pixels*scale)
+                np.testing.assert_allclose(processed, reference, rtol=1e-5, atol=1e-6, err_msg=style)
+
+        # The moncurve styles invert each other, on both sides of the break point
+        values = np.array([[0.001, 0.003, 0.01], [0.04, 0.2, 1.0]], dtype=np.float32)
+        pl = ProcessList()
+        for style in ['moncurveFwd', 'moncurveRev']:
+            gamma = Gamma(bitDepths["FLOAT32"], bitDepths["FLOAT32"], "gammaId", style, style)
+            gamma.setGamma(2.4, 0.055)
+            pl.addProcess(gamma)
+        np.testing.assert_allclose(pl.processArray(values), values, rtol=1e-5)
+    #test24Gamma
+
+    def test25Log(self):
+        """
+        Performs tests on whole-buffer processing of Log nodes.
+        """
+        np.random.seed(25)
+        pixels = np.random.uniform(-0.25, 1.25, (64, 4)).astype(np.float32)
+        pixels[0, :3] = [float('nan'), 0.0, 1e-39]
+
+        for style in ['log10', 'log2', 'antiLog10', 'antiLog2', 'logToLin', 'linToLog']:
+            for (inBitDepth, outBitDepth, scale) in [
+                (bitDepths["FLOAT16"], bitDepths["FLOAT16"], 1.0),
+                (bitDepths["UINT10"], bitDepths["FLOAT32"], 1023.0)]:
+                log = Log(inBitDepth, outBitDepth, "logId", "Log1", style)
+                log.setLogParams(0.6, 685.0, 95.0, 1.0, 0.0)
+                log.setLogParams(0.55, 700.0, 90.0, 0.9, 0.01, "B")
+
+                pl = ProcessList()
+                pl.addProcess(log)
+
+                reference = self.processPixels(pl, pixels*scale)
+                processed = pl.processArray(pixels*scale)
+                np.testing.assert_allclose(processed, reference, rtol=1e-5, atol=1e-5, err_msg=style)
+    #test25Log
+
+    def test26ExposureContrast(self):
+        """
+        Performs tests on processing with ExposureContrast nodes and changing
+        their parameters after compiling.
+        """
+        np.random.seed(26)
+        pixels = np.random.uniform(-0.25, 1.25, (64, 4)).astype(np.float32)
+
+        # Exposure of 1 stop, contrast of 1
+        gains = {'linear':2.0, 'video':pow(2.0, 1.0/1.83)}
+        for style in ['linear', 'video', 'log']:
+            for (inBitDepth, outBitDepth, scale) in [
+                (bitDepths["FLOAT16"], bitDepths["FLOAT16"], 1.0),
+                (bitDepths["UINT10"], bitDepths["FLOAT32"], 1023.0)]:
+                ecp = ExposureContrast(inBitDepth, outBitDepth, "ecpId", "EC1", style)
+                ecp.setExposureContrastPivot(0.5, 1.2, 0.18)
+
+                pl = ProcessList()
+                pl.addProcess(ecp)
+
+                reference = self.processPixels(pl, pixels*scale)
+                processed = pl.processArray(pixels*scale)
+                np.testing.assert_allclose(processed, reference, rtol=1e-5, atol=1e-6, err_msg=style)
+
+                # Alpha is copied from the same pixel
+                np.testing.assert_array_equal(reference[:, 3], pixels[:, 3]*scale)
+
+            ecp = ExposureContrast(bitDepths["FLOAT32"], bitDepths["FLOAT32"], "ecpId", "EC1", style)
+            ecp.setExposureContrastPivot(1.0, 1.0, 0.18)
+            pl = ProcessList()
+            pl.addProcess(ecp)
+
+            values = np.array([[0.1, 0.18, 0.5]], dtype=np.float32)
+            if style == 'log':
+                expected = values + 0.6/2.046*math.log10(2.0)
+            else:
+                expected = values*gains[style]
+            np.testing.assert_allclose(pl.processArray(values), expected, rtol=1e-5, err_msg=style)
+
+        # Dynamic parameters apply to compiled ProcessLists, including Groups
+        ecp1 = ExposureContrast(bitDepths["FLOAT32"], bitDepths["FLOAT32"], "ecpId", "EC1", "linear")
+        ecp1.setDynamicParam("EXPOSURE")
+        ecp2 = ExposureContrast(bitDepths["FLOAT32"], bitDepths["FLOAT32"], "ecpId", "EC2", "linear")
+        ecp2.setDynamicParam("EXPOSURE")
+        ecp2.setDynamicParam("CONTRAST")
+        gpn = Group(bitDepths["FLOAT32"], bitDepths["FLOAT32"], "groupId", "Group1")
+        gpn.addProcess(ecp2)
+
+        pl = ProcessList()
+        pl.addProcess(ecp1)
+        pl.addProcess(gpn)
+        plan = pl.compile()
+
+        values = np.array([[0.1, 0.2, 0.4]], dtype=np.float32)
+        np.testing.assert_allclose(plan.processArray(values), values, rtol=1e-6)
+
+        self.assertEqual(pl.setDynamicParamValue("EXPOSURE", 1.0), 2)
+        np.testing.assert_allclose(plan.processArray(values), values*4.0, rtol=1e-6)
+
+        self.assertEqual(pl.setDynamicParamValue("CONTRAST", 2.0), 1)
+        np.testing.assert_allclose(plan.processArray(values), (values*4.0)**2.0, rtol=1e-6)
+
+        self.assertEqual(pl.setDynamicParamValue("PIVOT", 0.5), 0)
+        ecp1.setExposure(0.0)
+        ecp2.setContrast(1.0)
+        np.testing.assert_allclose(plan.processArray(values), values*2.0, rtol=1e-6)
+        self.assertEqual(ecp2.getExposureContrastPivot(), (1.0, 1.0, 1.0))
+    #test26ExposureContrast
+
+    def test27IndexMap(self):
+        """
+        Performs tests on whole-buffer evaluation of IndexMaps and of LUTs 
+        that use them.
+        """
+        inf = float('inf')
+        nan = float('nan')
+
+        # Inputs with a repeated point, evaluated at and between the points
+        indexMap = IndexMap(6, [[0.0, 64.0, 64.0, 512.0, 940.0, 1023.0], 
+            [0.0, 1.0, 1.5, 8.0, 15.0, 16.0]])
+        values = np.array([-inf, -1.0, 0.0, 32.0, 64.0, 100.0, 512.0, 
+            700.0, 1023.0, 1100.0, inf, nan])
+        expected = [indexMap.process(value) for value in values]
+        np.testing.assert_allclose(indexMap.processArray(values), expected, rtol=1e-12)
+        np.testing.assert_allclose(indexMap.processArray(values)[1:10], 
+            [0.0, 0.0, 0.5, 1.0, 1.5 + 36.0/448.0*6.5, 8.0, 8.0 + 188.0/428.0*7.0, 16.0, 16.0])
+
+        # Cached evaluation over the half domain
+        cachedIndexMap = IndexMap(3, [[0.0, 0.5, 1.0], [0.0, 2.0, 4.0]], useCachedProcess=True)
+        self.assertAlmostEqual(cachedIndexMap.process(0.25), 1.0, places=3)
+
+        np.random.seed(27)
+        pixels = np.random.uniform(-64.0, 1100.0, (64, 4)).astype(np.float32)
+        pixels[0, :3] = [nan, inf, -inf]
+
+        # One Index Map for all channels and one Index Map per channel
+        l1d1 = LUT1D(bitDepths["UINT10"], bitDepths["FLOAT16"], "l1dId", "LUT1D1")
+        l1d1.setArray(3, [0.0, 0.0, 0.0, 0.25, 0.5, 0.75, 1.0, 1.0, 1.0])
+        l1d1.setIndexMaps([[0.0, 256.0, 1023.0], [0.0, 1.0, 2.0]])
+
+        l1d3 = LUT1D(bitDepths["UINT10"], bitDepths["FLOAT16"], "l1dId", "LUT1D3")
+        l1d3.setArray(1, [0.0, 0.1, 0.3, 1.0])
+        l1d3.setIndexMaps([[0.0, 1023.0], [0.0, 3.0]], 
+            [[0.0, 512.0, 1023.0], [0.0, 2.0, 3.0]], 
+            [[100.0, 200.0, 900.0], [0.0, 1.0, 3.0]])
+
+        l3d = simple3DLUT("l3dId", "LUT3D1", [3, 3, 3], lambda x, y, z: [y, z*z, x**0.5],
+            inBitDepth=bitDepths["UINT10"])
+        l3d.setAttribute('interpolation', 'tetrahedral')
+        l3d.setIndexMaps([[0.0, 768.0], [0.0, 2.0]])
+
+        for lut in [l1d1, l1d3, l3d]:
+            pl = ProcessList()
+            pl.addProcess(lut)
+
+            reference = self.processPixels(pl, pixels)
+            np.testing.assert_allclose(pl.processArray(pixels), reference, rtol=1e-5, atol=1e-6)
+    #test27IndexMap
+
+    def test28ArrayRead(self):
+        """
+        Performs tests on parsing Array elements.
+        """
+        def readArray(dimensions, text):
+            element = etree.Element('Array')
+            element.set('dim', dimensions)
+            element.text = text
+            array = Array.Array()
+            array.read(element)
+            return array
+
+        # Decimal floats and integers, in any layout, match float()
+        text = "\n   0.1 -2.5e-3 1023\n\t1.000000001 +4 nan\n\t\tinf -inf 65504.0\n\t\t"
+        array = readArray("3 3", text)
+        expected = np.array(map(float, text.split()), dtype=np.float32)
+        np.testing.assert_array_equal(array.getValues(), expected)
+        self.assertEqual(array.getValues().dtype, np.float32)
+
+        # Matrix dimensions include the number of color components
+        array = readArray("3 4 3", " ".join(["0.5"]*12))
+        self.assertEqual(array.getValueCount(), 12)
+
+        # The number of values has to match the dimensions
+        self.assertRaises(Errors.InvalidArrayError, readArray, "2 2 2 3", " ".join(["1.0"]*23))
+        self.assertRaises(Errors.InvalidArrayError, readArray, "2 3", "1.0 2.0 3.0 x 5.0 6.0")
+    #test28ArrayRead
+
+    def test29ArrayFloatEncoding(self):
+        """
+        Performs tests on writing and reading Arrays with floatEncodings.
+        """
+        values = [0.0, -0.0, 1.0, -2.5, 0.1, 6.0e-8, 65504.0, float('inf'), float('nan')]
+
+        encodings = [
+            ('integer16bit', np.float16, lambda x: str(Common.halfToUInt16(x))),
+            ('integer32bit', np.float32, lambda x: str(Common.float32ToUInt32(x))),
+            ('integer64bit', np.float64, lambda x: str(Common.doubleToUInt64(x))),
+            ('hex16bit', np.float16, Common.halfToHex),
+            ('hex32bit', np.float32, Common.float32ToHex),
+            ('hex64bit', np.float64, Common.doubleToHex)]
+
+        for (encoding, floatType, encode) in encodings:
+            array = Array.Array([len(values), 1], values, floatEncoding=encoding)
+            element = array.write(etree.Element('LUT1D'))
+            self.assertEqual(element.get('floatEncoding'), encoding)
+
+            # The same text as encoding one value at a time
+            self.assertEqual(element.text.split(), map(encode, values))
+
+            # Values are read back exactly
+            arrayRead = Array.Array()
+            arrayRead.read(element)
+            readValues = arrayRead.getValues()
+            self.assertEqual(readValues.dtype, floatType)
+            np.testing.assert_array_equal(readValues.view(Common.floatEncodingTypes[encoding][1]),
+                np.array(values, dtype=floatType).view(Common.floatEncodingTypes[encoding][1]))
+
+        # Hex values need all of their digits
+        element = etree.Element('LUT1D')
+        element.set('dim', '2 1')
+        element.set('floatEncoding', 'hex16bit')
+        element.text = "3c00 c00"
+        self.assertRaises(Errors.InvalidArrayError, Array.Array().read, element)
+        element.text = "3c00 c0g0"
+        self.assertRaises(Errors.InvalidArrayError, Array.Array().read, element)
+    #test29ArrayFloatEncoding
+
+    def test30WriteStreaming(self):
+        """
+        Performs tests on streaming *CLF* files to disk.
+        """
+        pl = self.createCLF(self._tmpclf)
+
+        # Streamed files match the pretty-printed document
+        pl.writeFile(self._tmpclf)
+        with open(self._tmpclf, 'rb') as fp:
+            streamed = fp.read()
+        self.assertEqual(streamed, ProcessList.xmlPrettify(pl.write(), self._tmpclf))
+
+        # Array element text is only formatted when it's used
+        l3d = simple3DLUT("l3dId", "LUT3D1", [3, 3, 3], lambda x, y, z: [x, y*y, 0.5*z])
+        element = l3d.write(etree.Element('ProcessList')).find('Array')
+        self.assertEqual(len(element.text.split()), 81)
+        self.assertEqual("".join(l3d._array.iterTextChunks(rowsPerChunk=4)), element.text)
+        element.text = "0.5"
+        self.assertEqual(element.text, "0.5")
+    #test30WriteStreaming
+
 def unittests():
     suite = unittest.TestLoader().loadTestsFromTestCase(TestCLF)
     unittest.TextTestRunner(verbosity=2).run(suite)
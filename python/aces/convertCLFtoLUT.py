@@ -74,11 +74,13 @@ def convertCLFtoLUT(clfPath,
                     inputMin=0.0,
                     inputMax=1.0,
                     shaperIn=['linear',0.0,1.0],
-                    shaperOut=['linear',0.0,1.0]):
+                    shaperOut=['linear',0.0,1.0],
+                    profile=False):
     
     # Load CLF
     print( "Reading CLF : %s" % clfPath )
     processList = clf.ProcessList(clfPath)
+    processList.setProfiling(profile)
 
     # Write new LUT format
     print( "Writing LUT : %s" % lutPath )
@@ -94,6 +96,9 @@ def convertCLFtoLUT(clfPath,
                               shaperIn,
                               shaperOut)
 
+    if profile:
+        print( "Profile : \n%s" % processList.getProfileJSON() )
+
 def main():
     import optparse
 
@@ -157,6 +162,8 @@ def main():
 
     p.add_option('--shaperOut', '', type='string', nargs=3,
                  action='append', help="3 values: shaperType (linear, log2) min max")
+    p.add_option('--profile', '', action='store_true',
+                 help="Print the time spent in each ProcessNode as JSON")
 
     options, arguments = p.parse_args()
 
@@ -173,6 +180,7 @@ def main():
     generate1d = options.generate1d is True
     generate3d = options.generate3d is True
     generate1d3d1d = options.generate1d3d1d is True
+    profile = options.profile is True
 
     if options.shaperIn is not None:
         #print( options.shaperIn )
@@ -242,7 +250,8 @@ def main():
                         inputMinValue,
                         inputMaxValue,
                         [shaperInType, shaperInMin, shaperInMax],
-                        [shaperOutType, shaperOutMin, shaperOutMax])
+                        [shaperOutType, shaperOutMin, shaperOutMax],
+                        profile)
 
 # main
 
@@ -354,7 +354,7 @@ def filterRow_pixel(row,
         pvalue = np.array(ovalue, dtype=np.float32)
         # Reset values if input image and CLF input bit depths don't match
         if InRange:
-            pvalue = InRange.process(pvalue)
+            pvalue = InRange.process(pvalue, stride=1)
 
         # Process values
         #print( "Processing %04d, %04d : %s" % (i, j, ovalue))
@@ -362,7 +362,7 @@ def filterRow_pixel(row,
 
         # Reset values if output image and CLF output bit depths don't match
         if OutRange:
-            pvalue = OutRange.process(pvalue)
+            pvalue = OutRange.process(pvalue, stride=1)
 
         if verbose:
             print( "Processed %04d, %04d : %s -> %s" % (i, j, ovalue, pvalue))
@@ -399,7 +399,7 @@ def filterRow_stride(row,
 
     # Reset values if input image and CLF input bit depths don't match
     if InRange:
-        pvalue = InRange.process(pvalue, stride=channels)
+        pvalue = InRange.process(pvalue, stride=1)
 
     # Process values
     #print( "Processing %04d, %04d : %s" % (i, j, ovalue))
@@ -407,7 +407,7 @@ def filterRow_stride(row,
 
     # Reset values if output image and CLF output bit depths don't match
     if OutRange:
-        pvalue = OutRange.process(pvalue, stride=channels)
+        pvalue = OutRange.process(pvalue, stride=1)
 
     if verbose:
         print( "Processed %04d : %s -> %s" % (row, ovalue, pvalue))
@@ -446,7 +446,7 @@ def filterRow_parallel(row,
     pvalue = np.array(ovalue, dtype=np.float32)
     # Reset values if input image and CLF input bit depths don't match
     if InRange:
-        pvalue = InRange.process(pvalue, stride=channels)
+        pvalue = InRange.process(pvalue, stride=1)
 
     # Process values
     #print( "Processing %04d, %04d : %s" % (i, j, ovalue))
@@ -454,7 +454,7 @@ def filterRow_parallel(row,
 
     # Reset values if output image and CLF output bit depths don't match
     if OutRange:
-        pvalue = OutRange.process(pvalue, stride=channels)
+        pvalue = OutRange.process(pvalue, stride=1)
 
     #t1 = timeit.default_timer()
     #elapsed = t1 - t0
@@ -510,6 +510,9 @@ def filterImageWithCLF(inputPath,
     # 1: from the bitdepth of the input image to the bit depth of the CLF start
     # 2: from the bitdepth of the CLF output to the bit depth of the output image
     #
+    # The Ranges are applied with a stride of 1 so that alpha and other 
+    # channels are converted along with the color channels
+    #
     processListInBitDepth = processList.getInBitDepth()
     processListOutBitDepth = processList.getOutBitDepth()
 
@@ -585,9 +588,7 @@ def filterImageWithCLF(inputPath,
     else:
         print( "Filtering image - single threaded" )
 
-        #for j in range(height):
-        j = 5
-        if True:
+        for j in range(height):
             # Using filterRow_stride instead of filterRow_pixel
             # Processing a full row is ~10% faster than processing individual pixels
             filterRow_stride(j,
@@ -646,6 +647,8 @@ def main():
     p.add_option('--multithreaded', '-m', type='int', default=cpu_count())
     p.add_option("--compression")
     p.add_option("--quality", type="int", dest="quality", default = -1)
+    p.add_option('--profile', '', action="store_true",
+        help="Print the time spent in each ProcessNode as JSON. Filters using a single thread.")
 
     options, arguments = p.parse_args()
 
@@ -661,6 +664,7 @@ def main():
     multithreaded = min(cpu_count(), max(1, multithreaded))
     compression = options.compression
     compressionQuality = options.quality
+    profile = options.profile == True
 
     try:
         argsStart = sys.argv.index('--') + 1
@@ -686,6 +690,11 @@ def main():
         processList = clf.ProcessList(clfPath)
         print( "Loaded CLF - title: %s, path: %s" % (processList.getName(), clfPath) )
 
+        # Profiling information isn't gathered from the worker processes
+        if profile:
+            processList.setProfiling(True)
+            multithreaded = 1
+
     #
     # Filter an image
     #
@@ -698,6 +707,9 @@ def main():
             multithreaded=multithreaded,
             compression=compression,
             compressionQuality=compressionQuality)
+
+        if profile:
+            print( "Profile : \n%s" % processList.getProfileJSON() )
 # main
 
 if __name__ == '__main__':
@@ -67,6 +67,7 @@ __version__ = '.'.join((__major_version__,
 
 import os
 import math
+import numpy as np
 
 import clf
 from clf.Common import halfToUInt16, uint16ToHalf
@@ -453,56 +454,42 @@ def sample1D3D1D(processList,
     if shaperInType != None:
         #print( "sampleAndWrite1D3D1D - create input shaper" )
 
-        samples1dIn = [0.0]*lutResolution1dIn*3
-        for lutIndex in range(lutResolution1dIn):
-            sampleValue = float(lutIndex)/(lutResolution1dIn-1)*(
-                inputMax - inputMin) + inputMin
+        sampleValues = np.linspace(inputMin, inputMax, lutResolution1dIn)
+        lutValues = shaperInPL.process(np.repeat(sampleValues, 3).reshape(-1, 3))
 
-            lutValue = shaperInPL.process([sampleValue]*3)
-
-            #print( "%3.3f -> %3.3f" % (sampleValue, lutValue[0]))
-
-            samples1dIn[lutIndex*3:(lutIndex+1)*3] = lutValue
+        samples1dIn = list(lutValues.ravel())
     else:
         samples1dIn = None
 
     #
     # Sample all values in 3D range
     # - Use the inverse sampler at the head of the sampling process
+    # - All of the samples are processed as a single buffer
     #
     #print( "sampleAndWrite1D3D1D - create 3D LUT" )
 
-    samples3d = [[[[0.0,0.0,0.0] for i in xrange(lutResolution3d[0])] for i in xrange(lutResolution3d[1])] for i in xrange(lutResolution3d[2])]
-
-    for r in range(lutResolution3d[0]):
-        for g in range(lutResolution3d[1]):
-            for b in range(lutResolution3d[2]):
-
-                sampleValueR = float(r)/(lutResolution3d[0]-1)
-                sampleValueG = float(g)/(lutResolution3d[1]-1)
-                sampleValueB = float(b)/(lutResolution3d[2]-1)
-                sampleValue = [sampleValueR, sampleValueG, sampleValueB]
-
-                if shaperInType != None:
-                    shaperInInverseValue = shaperInPLInverse.process(sampleValue)
-                else:
-                    shaperInInverseValue = sampleValue
+    (sampleValuesR, sampleValuesG, sampleValuesB) = np.meshgrid(
+        np.linspace(0.0, 1.0, lutResolution3d[0]),
+        np.linspace(0.0, 1.0, lutResolution3d[1]),
+        np.linspace(0.0, 1.0, lutResolution3d[2]), indexing='ij')
+    sampleValues = np.dstack( [sampleValuesR.ravel(), sampleValuesG.ravel(), sampleValuesB.ravel()] )[0]
 
-                processedValue = processList.process(shaperInInverseValue)
+    if shaperInType != None:
+        shaperInInverseValues = shaperInPLInverse.process(sampleValues)
+    else:
+        shaperInInverseValues = sampleValues
 
-                if shaperOutType != None:
-                    shaperOutValue = shaperOutPL.process(processedValue)
-                else:
-                    shaperOutValue = processedValue
+    processedValues = processList.process(shaperInInverseValues)
 
-                lutValue = shaperOutValue
+    if shaperOutType != None:
+        shaperOutValues = shaperOutPL.process(processedValues)
+    else:
+        shaperOutValues = processedValues
 
-                #print( "%d, %d, %d : %3.3f, %3.3f, %3.3f -> %3.3f, %3.3f, %3.3f" % (
-                #    r, g, b,
-                #    sampleValueR, sampleValueG, sampleValueB,
-                #    lutValue[0], lutValue[1], lutValue[2]))
+    lutValues = np.reshape(shaperOutValues[:, :3], 
+        (lutResolution3d[0], lutResolution3d[1], lutResolution3d[2], 3))
 
-                samples3d[r][g][b] = lutValue
+    samples3d = lutValues.tolist()
 
     #
     # Create the output shaper samples
@@ -510,13 +497,10 @@ def sample1D3D1D(processList,
     if shaperOutType != None:
         #print( "sampleAndWrite1D3D1D - create output shaper" )
 
-        samples1dOut = [0.0]*lutResolution1dOut*3
-        for lutIndex in range(lutResolution1dOut):
-            sampleValue = float(lutIndex)/(lutResolution1dOut-1)
-
-            lutValue = shaperInPLInverse.process([sampleValue]*3)
+        sampleValues = np.linspace(0.0, 1.0, lutResolution1dOut)
+        lutValues = shaperOutPLInverse.process(np.repeat(sampleValues, 3).reshape(-1, 3))
 
-            samples1dOut[lutIndex*3:(lutIndex+1)*3] = lutValue
+        samples1dOut = list(lutValues.ravel())
     else:
         samples1dOut = None
 